@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Пакетне тестування оптимізаторів на мережах різного розміру
+"""
+
+import csv
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from models.network import LogisticsNetwork
+from optimizers.coordinate import CoordinateOptimizer
+from optimizers.genetic import GeneticOptimizer
+from services.data_loader import (load_network_from_csv, load_network_from_npz,
+                                  validate_network_data)
+from services.network_generator import NetworkGenerator
+
+# Розміри тестових мереж (кількість споживачів)
+TEST_DIMENSIONS = (10, 15, 20, 25, 30, 40)
+
+# Роздільники звітів готуються один раз на модуль
+_SEP60 = '=' * 60
+_SEP80 = '=' * 80
+_TABLE_SEP = ('-' * 3 + '-+-' + '-' * 12 + '-+-' + '-' * 12 + '-+-'
+              + '-' * 7 + '-+-' + '-' * 7 + '-+-' + '-' * 12 + '-+-'
+              + '-' * 7 + '-+-' + '-' * 7)
+
+# Дисковий мемо результатів: ключ — хеш файлу мережі плюс метод та його
+# гіперпараметри (у ГА в ключі явний сід, інакше кеш не має сенсу)
+_CACHE_DIR = 'results/batch_tests/cache'
+_MPO_KEY = 'mpo_s2.0_i50'
+_GA_KEY = 'ga_p25_g100_s42'
+
+
+def _network_hash(network_path: str) -> str:
+    """Хеш вмісту файлу мережі для ключів дискового мемо"""
+    with open(network_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _cached_run(runner, network, cache_path: str, use_cache: bool):
+    """
+    Виконує runner(network) із мемоізацією результату на диску
+
+    При повторних запусках на незмінній мережі з тими самими
+    гіперпараметрами результат (включно з виміряним часом) читається
+    з pickle замість хвилин повторної оптимізації.
+    """
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    result = runner(network)
+    if use_cache:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump(result, f)
+    return result
+
+
+def generate_test_networks(dimensions=TEST_DIMENSIONS,
+                           data_dir: str = 'data/test_networks'):
+    """
+    Генерує набір тестових мереж заданих розмірів
+
+    Args:
+        dimensions: Кількості споживачів тестових мереж
+        data_dir: Каталог для CSV-файлів
+
+    Returns:
+        Список кортежів (шлях до CSV, розмір мережі)
+    """
+    # Генерація детермінована за (n, сід), тому наявний .npz валідний і
+    # повторні запуски минають генерацію; відсутні мережі генеруються
+    # паралельно — генератори не ділять стану ГВЧ
+    missing = [n for n in dimensions
+               if not os.path.exists(os.path.join(data_dir, f'network_n{n}.npz'))]
+    if missing:
+        with ProcessPoolExecutor(max_workers=min(len(missing),
+                                                 os.cpu_count() or 1)) as executor:
+            list(executor.map(_generate_one, missing, [data_dir] * len(missing)))
+    return [(os.path.join(data_dir, f'network_n{n}.npz'), n)
+            for n in dimensions]
+
+
+def _generate_one(n: int, data_dir: str) -> str:
+    """Генерує та зберігає одну тестову мережу розміру n"""
+    generator = NetworkGenerator(seed=42 + n)
+    nodes = generator.generate_network(n_terminals=max(3, n // 5),
+                                       n_consumers=n)
+    generator.save_to_csv(nodes, os.path.join(data_dir, f'network_n{n}.csv'))
+    return generator.save_to_npz(nodes, os.path.join(data_dir, f'network_n{n}.npz'))
+
+
+def _run_mpo(network: LogisticsNetwork):
+    """Виконує МПО на власній копії мережі; повертає (результати, час)"""
+    optimizer = CoordinateOptimizer(network=network, step_size=2.0,
+                                    max_iterations=50, tolerance=0.1)
+    t0 = time.perf_counter_ns()
+    results = optimizer.optimize(verbose=False)
+    return results, (time.perf_counter_ns() - t0) * 1e-9
+
+
+def _run_ga(network: LogisticsNetwork):
+    """Виконує ЕМ-ГА на власній копії мережі; повертає (результати, час)"""
+    optimizer = GeneticOptimizer(network=network, population_size=25,
+                                 generations=100, seed=42)
+    t0 = time.perf_counter_ns()
+    results = optimizer.optimize(verbose=False)
+    return results, (time.perf_counter_ns() - t0) * 1e-9
+
+
+def run_optimization_test(network_path: str, n: int, quiet: bool = False,
+                          use_cache: bool = True):
+    """
+    Проганяє МПО та ЕМ-ГА на одній тестовій мережі
+
+    Методи працюють на незалежних копіях мережі без спільного стану,
+    тому запускаються паралельно у двох процесах: час тесту —
+    max(t_МПО, t_ГА) замість суми. Результати мемоізуються на диску за
+    хешем файлу мережі та гіперпараметрами методу.
+
+    Args:
+        network_path: Шлях до CSV мережі
+        n: Розмір мережі (для звіту)
+        quiet: Не друкувати проміжні повідомлення (пакетний режим)
+        use_cache: Використовувати дисковий мемо результатів
+
+    Returns:
+        Словник з витратами, покращеннями та часами обох методів
+    """
+    if network_path.endswith('.npz'):
+        centers, terminals, consumers = load_network_from_npz(network_path)
+    else:
+        centers, terminals, consumers = load_network_from_csv(network_path)
+    validate_network_data(centers, terminals, consumers)
+    network = LogisticsNetwork(centers, terminals, consumers)
+    initial_cost = network.calculate_costs()['total_cost']
+
+    if not quiet:
+        print(f"\n{_SEP60}")
+        print(f"ТЕСТ МЕРЕЖІ n={n} ({network_path})")
+        print(_SEP60)
+        print(f"Початкові витрати: {initial_cost:,.2f}")
+
+    network_hash = _network_hash(network_path)
+    mpo_cache = os.path.join(_CACHE_DIR, f'{network_hash}_{_MPO_KEY}.pkl')
+    ga_cache = os.path.join(_CACHE_DIR, f'{network_hash}_{_GA_KEY}.pkl')
+
+    if use_cache and os.path.exists(mpo_cache) and os.path.exists(ga_cache):
+        # Обидва результати в кеші — пул процесів не потрібен
+        mpo_results, mpo_time = _cached_run(_run_mpo, network, mpo_cache, True)
+        ga_results, ga_time = _cached_run(_run_ga, network, ga_cache, True)
+    else:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            future_mpo = executor.submit(_cached_run, _run_mpo,
+                                         network.clone(), mpo_cache, use_cache)
+            future_ga = executor.submit(_cached_run, _run_ga,
+                                        network.clone(), ga_cache, use_cache)
+            mpo_results, mpo_time = future_mpo.result()
+            ga_results, ga_time = future_ga.result()
+
+    if not quiet:
+        print(f"МПО: {mpo_results['final_cost']:,.2f} "
+              f"({mpo_results['percentage_improvement']:.2f}%) за {mpo_time:.2f} с")
+        print(f"ЕМ-ГА: {ga_results['final_cost']:,.2f} "
+              f"({ga_results['percentage_improvement']:.2f}%) за {ga_time:.2f} с")
+
+    # Відхилення ГА від МПО (наскільки ГА не дотягнув до МПО)
+    ga_error = ((ga_results['final_cost'] - mpo_results['final_cost'])
+                / mpo_results['final_cost'] * 100)
+
+    return {
+        'n': n,
+        'initial_cost': initial_cost,
+        'mpo_cost': mpo_results['final_cost'],
+        'mpo_improvement': mpo_results['percentage_improvement'],
+        'mpo_time': mpo_time,
+        'ga_cost': ga_results['final_cost'],
+        'ga_improvement': ga_results['percentage_improvement'],
+        'ga_time': ga_time,
+        'ga_error': ga_error,
+    }
+
+
+_CSV_HEADER = ('n', 'initial_cost', 'mpo_cost', 'mpo_improvement',
+               'mpo_time', 'ga_cost', 'ga_improvement', 'ga_time', 'ga_error')
+
+
+def _result_row(result):
+    """Перетворює результат тесту на рядок зведеного CSV"""
+    return (result['n'],
+            round(result['initial_cost'], 2),
+            round(result['mpo_cost'], 2),
+            round(result['mpo_improvement'], 2),
+            round(result['mpo_time'], 3),
+            round(result['ga_cost'], 2),
+            round(result['ga_improvement'], 2),
+            round(result['ga_time'], 3),
+            round(result['ga_error'], 2))
+
+
+def run_batch_tests(dimensions=TEST_DIMENSIONS, use_cache: bool = True):
+    """
+    Запускає пакетне тестування на мережах різного розміру
+
+    Тести незалежні (кожен працює на власній мережі), тому
+    виконуються паралельно у пулі процесів: сумарний час — близько
+    часу найбільшої мережі замість суми всіх.
+
+    Args:
+        dimensions: Кількості споживачів тестових мереж
+        use_cache: Використовувати дисковий мемо результатів
+            (прапорець --no-cache у CLI вимикає)
+    """
+    print(f"\n{_SEP60}")
+    print("ПАКЕТНЕ ТЕСТУВАННЯ ОПТИМІЗАТОРІВ")
+    print(_SEP60)
+
+    test_networks = generate_test_networks(dimensions)
+    print(f"Згенеровано {len(test_networks)} тестових мереж: "
+          f"{', '.join(f'n={n}' for _, n in test_networks)}")
+
+    # Зведення пишеться потоково у порядку завершення тестів: рядок
+    # лягає на диск одразу після тесту, тож аварія пізньої мережі не
+    # втрачає вже готових результатів
+    results_dir = 'results/batch_tests'
+    os.makedirs(results_dir, exist_ok=True)
+    filepath = os.path.join(
+        results_dir, f"batch_results_{datetime.now():%Y%m%d_%H%M%S}.csv")
+
+    all_results = []
+    max_workers = min(len(test_networks), os.cpu_count() or 1)
+    with open(filepath, 'w', newline='', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_HEADER)
+        futures = {executor.submit(run_optimization_test, path, n, True,
+                                   use_cache): n
+                   for path, n in test_networks}
+        for future in as_completed(futures):
+            n = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"✗ Мережа n={n} завершилась з помилкою: {e}")
+                continue
+            all_results.append(result)
+            writer.writerow(_result_row(result))
+            f.flush()
+            print(f"✓ Мережа n={n} завершена")
+
+    # Результати приходять у порядку завершення — сортуємо за розміром
+    all_results.sort(key=lambda r: r['n'])
+
+    # Зведена таблиця збирається в один рядок і йде одним write:
+    # без блокування/скидання stdout на кожен print
+    lines = [
+        '', _SEP80, 'ЗВЕДЕННЯ ПАКЕТНОГО ТЕСТУВАННЯ', _SEP80,
+        f"{'n':>3} | {'Початкові':>12} | {'МПО':>12} | {'МПО %':>7} | "
+        f"{'МПО, с':>7} | {'ЕМ-ГА':>12} | {'ГА %':>7} | {'ГА, с':>7}",
+        _TABLE_SEP,
+    ]
+    lines.extend(
+        f"{result['n']:>3} | {result['initial_cost']:>12,.2f} | "
+        f"{result['mpo_cost']:>12,.2f} | {result['mpo_improvement']:>6.2f}% | "
+        f"{result['mpo_time']:>7.2f} | {result['ga_cost']:>12,.2f} | "
+        f"{result['ga_improvement']:>6.2f}% | {result['ga_time']:>7.2f}"
+        for result in all_results)
+    lines.append(_SEP80)
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+    print(f"\n📄 Зведення збережено: {filepath}")
+    return all_results
+
+
+if __name__ == '__main__':
+    run_batch_tests(use_cache='--no-cache' not in sys.argv)
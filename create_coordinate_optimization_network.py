@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Створення демонстраційної мережі для координатної оптимізації
+"""
+
+import numpy as np
+
+from services.network_generator import GeneratedNetwork, NetworkGenerator
+
+# Зміщення споживачів навколо центру кластера: п'ять кутів правильного
+# п'ятикутника радіуса 3. Таблиця обчислюється один раз на модуль —
+# без повторних cos/sin на кожен кластер
+_N_PER_CLUSTER = 5
+_ANGLES = np.linspace(0, 2 * np.pi, _N_PER_CLUSTER, endpoint=False)
+_DX = 3.0 * np.cos(_ANGLES)
+_DY = 3.0 * np.sin(_ANGLES)
+
+# Кластери споживачів по кутах області
+_CLUSTER_CENTERS = ((25.0, 25.0), (75.0, 25.0), (25.0, 75.0), (75.0, 75.0))
+
+# Стартові позиції терміналів — навмисно зміщені до середини області,
+# щоб МПО мав що оптимізувати, рухаючи їх до своїх кластерів
+_TERMINAL_STARTS = ((40.0, 50.0), (60.0, 50.0), (50.0, 40.0), (50.0, 60.0))
+
+
+def create_coordinate_optimization_network(
+        filepath: str = 'data/coordinate_test.csv') -> str:
+    """
+    Будує детерміновану мережу під демонстрацію МПО
+
+    Чотири щільні кластери по п'ять споживачів та чотири термінали,
+    зсунуті від кластерів: виграш координатної оптимізації на такій
+    мережі очевидний і відтворюваний.
+
+    Args:
+        filepath: Шлях до CSV мережі
+
+    Returns:
+        Шлях до записаного файлу
+    """
+    nodes = [{'id': 0, 'x': 50.0, 'y': 50.0, 'type': 'center', 'demand': 0,
+              'terminal_cost': 0, 'processing_cost': 0}]
+
+    next_id = 1
+    for x, y in _TERMINAL_STARTS:
+        nodes.append({'id': next_id, 'x': x, 'y': y, 'type': 'terminal',
+                      'demand': 0, 'terminal_cost': 5000,
+                      'processing_cost': 10})
+        next_id += 1
+
+    for cx, cy in _CLUSTER_CENTERS:
+        for i in range(_N_PER_CLUSTER):
+            nodes.append({'id': next_id, 'x': round(cx + _DX[i], 1),
+                          'y': round(cy + _DY[i], 1), 'type': 'consumer',
+                          'demand': 100, 'terminal_cost': 0,
+                          'processing_cost': 0})
+            next_id += 1
+
+    return NetworkGenerator().save_to_csv(GeneratedNetwork.from_nodes(nodes),
+                                          filepath)
+
+
+if __name__ == '__main__':
+    path = create_coordinate_optimization_network()
+    print(f"📄 Мережу для координатної оптимізації збережено: {path}")
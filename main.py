@@ -4,9 +4,15 @@
 """
 
 import copy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from services.data_loader import load_network_from_csv, validate_network_data, print_network_summary
 from models.network import LogisticsNetwork
 from optimizers.coordinate import CoordinateOptimizer
+from optimizers.genetic import GeneticOptimizer
+from services.export import ResultsExporter
 from services.visualization import NetworkVisualizer
 
 
@@ -86,7 +92,8 @@ def main():
     print("\n" + "=" * 60)
     print("ФІНАЛЬНІ ВИТРАТИ")
     print("=" * 60)
-    final_costs = network.calculate_costs()
+    # Оптимізатор уже обчислив фінальну розбивку — не перераховуємо
+    final_costs = results['final_costs_breakdown']
     network.cost_calculator.print_cost_breakdown(final_costs)
 
     # Виводимо результати оптимізації
@@ -120,5 +127,130 @@ def main():
     print("=" * 60)
 
 
+def _run_mpo(network):
+    """
+    Виконує оптимізацію МПО на власній копії мережі
+
+    Функція модульного рівня, щоб її можна було передати у воркер-процес.
+    """
+    optimizer = CoordinateOptimizer(
+        network=network,
+        step_size=2.0,
+        max_iterations=50,
+        tolerance=0.1
+    )
+    # perf_counter_ns — монотонний наносекундний лічильник; time.time()
+    # може стрибати разом із системним годинником
+    start = time.perf_counter_ns()
+    results = optimizer.optimize(verbose=False)
+    execution_time = (time.perf_counter_ns() - start) * 1e-9
+    return {
+        'results': results,
+        'network': network,
+        'costs': results['final_costs_breakdown'],
+        'execution_time': execution_time
+    }
+
+
+def _run_ga(network):
+    """
+    Виконує оптимізацію ЕМ-ГА на власній копії мережі
+
+    Острівна модель: 4 підпопуляції по 25 особин еволюціонують
+    паралельно та обмінюються чемпіонами кожні 20 поколінь.
+    """
+    optimizer = GeneticOptimizer(
+        network=network,
+        population_size=25,
+        generations=100,
+        seed=42,
+        n_islands=4
+    )
+    start = time.perf_counter_ns()
+    results = optimizer.optimize(verbose=False)
+    execution_time = (time.perf_counter_ns() - start) * 1e-9
+    return {
+        'results': results,
+        'network': network,
+        'costs': results['final_costs_breakdown'],
+        'execution_time': execution_time
+    }
+
+
+def run_comparison(network):
+    """
+    Порівняльний запуск МПО та ЕМ-ГА
+
+    Обидва методи працюють на незалежних копіях мережі та не ділять
+    змінюваного стану, тому запускаються паралельно у двох процесах:
+    час порівняння — max(t_МПО, t_ГА) замість суми.
+
+    Args:
+        network: Вихідна логістична мережа
+
+    Returns:
+        Словник {'mpo': ..., 'ga': ...} з результатами обох методів
+    """
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        future_mpo = executor.submit(_run_mpo, copy.deepcopy(network))
+        future_ga = executor.submit(_run_ga, copy.deepcopy(network))
+        return {'mpo': future_mpo.result(), 'ga': future_ga.result()}
+
+
+def print_comparison_table(comparison):
+    """Виводить порівняльну таблицю результатів МПО та ЕМ-ГА"""
+    mpo = comparison['mpo']
+    ga = comparison['ga']
+
+    print("\n" + "=" * 60)
+    print("ПОРІВНЯННЯ МЕТОДІВ ОПТИМІЗАЦІЇ")
+    print("=" * 60)
+    print(f"{'Метод':<10} | {'Витрати':>15} | {'Покращення':>12} | {'Час, с':>8}")
+    print("-" * 60)
+    for name, data in (('МПО', mpo), ('ЕМ-ГА', ga)):
+        results = data['results']
+        print(f"{name:<10} | {results['final_cost']:>15,.2f} | "
+              f"{results['percentage_improvement']:>11.2f}% | "
+              f"{data['execution_time']:>8.2f}")
+    print("=" * 60)
+
+
+def main_compare():
+    """
+    Режим порівняння: завантажує мережу та запускає обидва методи
+    """
+    print("\n" + "=" * 60)
+    print("ПОРІВНЯННЯ МЕТОДІВ ОПТИМІЗАЦІЇ ЛОГІСТИЧНОЇ МЕРЕЖІ")
+    print("=" * 60)
+
+    try:
+        centers, terminals, consumers = load_network_from_csv('data/network_data.csv')
+        validate_network_data(centers, terminals, consumers)
+        network = LogisticsNetwork(centers, terminals, consumers)
+    except Exception as e:
+        print(f"✗ Помилка підготовки мережі: {e}")
+        return
+
+    print_network_summary(centers, terminals, consumers)
+
+    comparison = run_comparison(network)
+    print_comparison_table(comparison)
+
+    # Експорт результатів: файл порівняння + накопичувальний журнал
+    exporter = ResultsExporter()
+    filepath = exporter.export_comparison(network, comparison,
+                                          dataset_name='network_data')
+    with exporter:
+        for method_name, data in (('МПО', comparison['mpo']),
+                                  ('ЕМ-ГА', comparison['ga'])):
+            exporter.append_to_experiments_log(
+                network, data['network'], data['results'], method_name,
+                'network_data', data['execution_time'])
+    print(f"\n📄 Результати збережено: {filepath}")
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+        main_compare()
+    else:
+        main()
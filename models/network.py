@@ -4,8 +4,10 @@
 """
 
 from typing import List, Dict
-from models.element import Center, Terminal, Consumer
-from services.distance import euclidean_distance, find_nearest_terminal
+
+import numpy as np
+
+from models.element import Center, Terminal, Consumer, NetworkArrays
 from services.cost_calculator import CostCalculator
 
 
@@ -30,6 +32,34 @@ class LogisticsNetwork:
         self.consumers = consumers
         self.cost_calculator = CostCalculator(transport_cost_per_unit)
 
+        # SoA-масиви для векторизованих обчислень
+        self.arrays = NetworkArrays.from_elements(centers, terminals, consumers)
+        self._tid_to_idx = {t.id: i for i, t in enumerate(terminals)}
+
+        # Споживачі читають призначення напряму з arrays.assigned —
+        # окремого атрибута на кожному об'єкті більше немає
+        for i, consumer in enumerate(consumers):
+            consumer._network = self
+            consumer._index = i
+
+        # Попит × тариф: постійний множник транспортних витрат споживача,
+        # обчислюється один раз і прибирає множення з гарячих ядер
+        self._demand_x_rate = self.arrays.demand * np.float32(transport_cost_per_unit)
+
+        # Кеш матриці відстаней споживач × термінал
+        self._D = np.hypot(self.arrays.ux[:, None] - self.arrays.tx[None, :],
+                           self.arrays.uy[:, None] - self.arrays.ty[None, :])
+        self._nearest_d = np.zeros(len(consumers), dtype=np.float32)
+        self._topk = None  # кеш top-k найближчих терміналів на споживача
+
+        # Безгілковий штраф неактивності: +inf до відстаней вимкнених
+        # терміналів, тож argmin не потребує маскування копією
+        self._active_penalty = np.where(self.arrays.is_active,
+                                        np.float32(0.0), np.float32(np.inf))
+
+        # Мемо розбивок витрат за станом мережі (обмежений, FIFO-витіснення)
+        self._cost_memo = {}
+
         # Ініціалізація початкової мережі
         self._initialize_network()
 
@@ -41,25 +71,122 @@ class LogisticsNetwork:
         """
         # Всі термінали активні за замовчуванням (встановлено в класі Terminal)
 
-        # Прив'язуємо кожного споживача до найближчого терміналу
-        for consumer in self.consumers:
-            nearest_terminal, _ = find_nearest_terminal(consumer, self.terminals)
-            consumer.assigned_terminal = nearest_terminal.id
+        # Прив'язка до найближчих терміналів — тим самим векторизованим
+        # шляхом, що й у оптимізаторів, за кешованою матрицею відстаней
+        self.assign_consumers_to_terminals()
+
+    def __deepcopy__(self, memo):
+        """copy.deepcopy делегує у clone() — без обходу графа об'єктів"""
+        return self.clone()
+
+    def clone(self) -> 'LogisticsNetwork':
+        """
+        Швидка незалежна копія мережі
+
+        Пряма заміна copy.deepcopy без його диспетчеризації та
+        memo-словника: масиви копіюються одним memcpy, а легкі об'єкти
+        елементів пересоздаються напряму.
+        """
+        new = object.__new__(LogisticsNetwork)
+        new.centers = [Center(c.id, c.x, c.y) for c in self.centers]
+        new.terminals = []
+        for t in self.terminals:
+            terminal = Terminal(t.id, t.x, t.y, t.terminal_cost, t.processing_cost)
+            terminal.is_active = t.is_active
+            new.terminals.append(terminal)
+        new.cost_calculator = CostCalculator(self.cost_calculator.transport_cost_per_unit)
+        new.arrays = self.arrays.copy()
+        new._demand_x_rate = self._demand_x_rate.copy()
+        new._tid_to_idx = dict(self._tid_to_idx)
+        new._D = self._D.copy()
+        new._nearest_d = self._nearest_d.copy()
+        new._topk = None
+        new._active_penalty = self._active_penalty.copy()
+        new._terminal_load = self._terminal_load.copy()
+        new._cost_memo = {}
+        # Призначення живуть у arrays.assigned — споживачам достатньо
+        # прив'язки до нової мережі
+        new.consumers = []
+        for i, c in enumerate(self.consumers):
+            consumer = Consumer(c.id, c.x, c.y, c.demand)
+            consumer._network = new
+            consumer._index = i
+            new.consumers.append(consumer)
+        return new
 
     def assign_consumers_to_terminals(self):
         """
         Прив'язує всіх споживачів до найближчих активних терміналів
+
+        Працює векторизовано на SoA-масивах: одна широкомовна операція
+        відстаней замість циклу по споживачах.
         """
-        for consumer in self.consumers:
-            nearest_terminal, _ = find_nearest_terminal(consumer, self.terminals, active_only=True)
-            consumer.assigned_terminal = nearest_terminal.id
+        arr = self.arrays
+        self._refresh_distance_cache()
+
+        if not arr.is_active.any():
+            raise ValueError("Немає доступних терміналів")
+
+        # Вибираємо найближчий активний термінал за кешованими відстанями;
+        # додавання штрафу замість булевого маскування — один прохід без гілок
+        masked = self._D + self._active_penalty
+        arr.assigned = masked.argmin(axis=1).astype(np.int32)
+        self._nearest_d = masked[np.arange(len(self.consumers)), arr.assigned]
+        self._terminal_load = np.bincount(arr.assigned, weights=arr.demand,
+                                          minlength=len(self.terminals))
+
+    def _refresh_distance_cache(self):
+        """
+        Синхронізує масиви терміналів та кеш матриці відстаней
+
+        Перераховує лише стовпці терміналів, координати яких змінилися з
+        часу останнього виклику — переміщення одного терміналу коштує
+        O(N_споживачів) замість повної перебудови матриці.
+        """
+        arr = self.arrays
+        for j, terminal in enumerate(self.terminals):
+            # Порівнюємо вже приведені до float32 значення, інакше
+            # непредставне число позначало б стовпець "брудним" назавжди
+            x = np.float32(terminal.x)
+            y = np.float32(terminal.y)
+            if arr.tx[j] != x or arr.ty[j] != y:
+                arr.tx[j] = x
+                arr.ty[j] = y
+                self._D[:, j] = np.hypot(arr.ux - x, arr.uy - y)
+                self._topk = None  # позиції змінились — top-k більше не дійсний
+            arr.is_active[j] = terminal.is_active
+            self._active_penalty[j] = 0.0 if terminal.is_active else np.inf
+
+    def get_topk_terminals(self, k: int = 5) -> np.ndarray:
+        """
+        Повертає індекси k найближчих терміналів для кожного споживача
+
+        Таблиця будується через np.argpartition один раз і кешується;
+        інвалідується при зміні позицій терміналів. Активність терміналів
+        не враховується — фільтрацію виконує споживач таблиці.
+
+        Args:
+            k: Кількість найближчих терміналів (обрізається до їх числа)
+
+        Returns:
+            Масив (n_споживачів, k) індексів терміналів, int32
+        """
+        k = min(k, len(self.terminals))
+        self._refresh_distance_cache()
+        if self._topk is None or self._topk.shape[1] != k:
+            if k == len(self.terminals):
+                order = np.argsort(self._D, axis=1)
+            else:
+                order = np.argpartition(self._D, kth=k - 1, axis=1)
+            self._topk = order[:, :k].astype(np.int32)
+        return self._topk
 
     def get_terminal_by_id(self, terminal_id: int) -> Terminal:
-        """Отримує термінал за ID"""
-        for terminal in self.terminals:
-            if terminal.id == terminal_id:
-                return terminal
-        raise ValueError(f"Термінал з ID {terminal_id} не знайдено")
+        """Отримує термінал за ID (пошук за словником, O(1))"""
+        try:
+            return self.terminals[self._tid_to_idx[terminal_id]]
+        except KeyError:
+            raise ValueError(f"Термінал з ID {terminal_id} не знайдено") from None
 
     def get_center(self) -> Center:
         """Повертає розподільчий центр (припускаємо один центр для MVP)"""
@@ -68,17 +195,24 @@ class LogisticsNetwork:
         return self.centers[0]
 
     def get_active_terminals(self) -> List[Terminal]:
-        """Повертає список активних терміналів"""
-        return [t for t in self.terminals if t.is_active]
+        """Повертає список активних терміналів (за маскою SoA)"""
+        return [self.terminals[i] for i in np.flatnonzero(self.arrays.is_active)]
+
+    def get_active_terminal_count(self) -> int:
+        """Кількість активних терміналів без побудови списку"""
+        return int(self.arrays.is_active.sum())
 
     def get_consumers_for_terminal(self, terminal_id: int) -> List[Consumer]:
         """Повертає список споживачів, прив'язаних до конкретного терміналу"""
-        return [c for c in self.consumers if c.assigned_terminal == terminal_id]
+        idx = self._tid_to_idx.get(terminal_id)
+        if idx is None:
+            return []
+        return [self.consumers[i] for i in np.flatnonzero(self.arrays.assigned == idx)]
 
     def get_terminal_load(self, terminal_id: int) -> float:
-        """Обчислює загальний попит для терміналу"""
-        consumers = self.get_consumers_for_terminal(terminal_id)
-        return sum(c.demand for c in consumers)
+        """Повертає загальний попит терміналу (з кешу останнього призначення)"""
+        idx = self._tid_to_idx.get(terminal_id)
+        return float(self._terminal_load[idx]) if idx is not None else 0.0
 
     def print_network_state(self):
         """Виводить поточний стан мережі"""
@@ -89,7 +223,7 @@ class LogisticsNetwork:
         center = self.get_center()
         print(f"\nЦентр: {center}")
 
-        print(f"\nАктивні термінали ({len(self.get_active_terminals())}/{len(self.terminals)}):")
+        print(f"\nАктивні термінали ({self.get_active_terminal_count()}/{len(self.terminals)}):")
         for terminal in self.get_active_terminals():
             load = self.get_terminal_load(terminal.id)
             num_consumers = len(self.get_consumers_for_terminal(terminal.id))
@@ -104,9 +238,9 @@ class LogisticsNetwork:
 
         print(f"\nСпоживачі ({len(self.consumers)}):")
         for i, consumer in enumerate(self.consumers[:5]):
-            terminal = self.get_terminal_by_id(consumer.assigned_terminal)
-            distance = euclidean_distance(consumer, terminal)
-            print(f"  {consumer} -> Термінал {terminal.id} (відстань: {distance:.2f})")
+            # Відстань уже відома з останнього призначення — не перераховуємо
+            print(f"  {consumer} -> Термінал {consumer.assigned_terminal} "
+                  f"(відстань: {self._nearest_d[i]:.2f})")
         if len(self.consumers) > 5:
             print(f"  ... та ще {len(self.consumers) - 5}")
 
@@ -116,11 +250,26 @@ class LogisticsNetwork:
         """
         Обчислює витрати поточної конфігурації мережі
 
+        Розбивка мемоізується за байтовим поданням стану (позиції та
+        активність терміналів, призначення), тож повторні запити того
+        самого стану — наприклад, після відкинутих пробних змін — не
+        перераховуються.
+
         Returns:
             Словник з детальною розбивкою витрат
         """
-        center = self.get_center()
-        return self.cost_calculator.calculate_total_cost(center, self.terminals, self.consumers)
+        self.arrays.sync_terminals(self.terminals)
+        arr = self.arrays
+        key = (arr.tx.tobytes(), arr.ty.tobytes(),
+               arr.is_active.tobytes(), arr.assigned.tobytes())
+        cached = self._cost_memo.get(key)
+        if cached is None:
+            cached = self.cost_calculator.calculate_total_cost_arrays(
+                arr, self._demand_x_rate)
+            if len(self._cost_memo) >= 64:
+                self._cost_memo.pop(next(iter(self._cost_memo)))
+            self._cost_memo[key] = cached
+        return dict(cached)
 
     def print_costs(self) -> None:
         """
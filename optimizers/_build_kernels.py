@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Одноразове прогрівання дискового кешу JIT-ядер
+
+Перша компіляція ядер numba займає десятки секунд — для інтерактивного
+main.py ця пауза помітна користувачеві. Запуск цього модуля один раз
+після встановлення (`python -m optimizers._build_kernels`) компілює всі
+ядра і зберігає машинний код у дисковому кеші numba (cache=True), тож
+наступні запуски завантажують готові бінарники за мілісекунди.
+"""
+
+import time
+
+from optimizers import _kernels, _ga_kernel
+
+
+def build():
+    """Компілює всі JIT-ядра та наповнює дисковий кеш numba"""
+    if not _kernels.NUMBA_AVAILABLE:
+        print("numba не встановлено — ядра працюватимуть як звичайний Python")
+        return
+
+    start = time.perf_counter()
+    _kernels.warmup()
+    _ga_kernel.warmup()
+    elapsed = time.perf_counter() - start
+    print(f"Ядра скомпільовано та закешовано за {elapsed:.1f} с")
+
+
+if __name__ == '__main__':
+    build()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+JIT-ядра для гарячих обчислень (numba — опціональна залежність)
+
+Якщо numba не встановлено, функції працюють як звичайний Python —
+повільніше, але з тим самим результатом.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Заглушка декоратора njit для роботи без numba"""
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def total_cost_components(assigned, ux, uy, demand, weight, tx, ty, active,
+                          terminal_cost, processing_cost, cx, cy, transport_rate):
+    """
+    Обчислює складові витрат мережі для заданого призначення споживачів
+
+    Args:
+        assigned: Індекс призначеного терміналу для кожного споживача (int32)
+        ux, uy, demand: Масиви споживачів
+        weight: Попередньо обчислене demand * transport_rate
+        tx, ty, active, terminal_cost, processing_cost: Масиви терміналів
+        cx, cy: Координати центру
+        transport_rate: Вартість транспортування за одиницю відстані
+
+    Returns:
+        Кортеж (fixed_costs, processing_costs, center_to_terminal, terminal_to_consumer)
+    """
+    n_terminals = tx.shape[0]
+    n_consumers = ux.shape[0]
+
+    fixed_costs = 0.0
+    for j in range(n_terminals):
+        if active[j]:
+            fixed_costs += terminal_cost[j]
+
+    terminal_demand = np.zeros(n_terminals)
+    terminal_to_consumer = 0.0
+    for i in range(n_consumers):
+        j = assigned[i]
+        dx = ux[i] - tx[j]
+        dy = uy[i] - ty[j]
+        terminal_to_consumer += math.sqrt(dx * dx + dy * dy) * weight[i]
+        terminal_demand[j] += demand[i]
+
+    processing_costs = 0.0
+    center_to_terminal = 0.0
+    for j in range(n_terminals):
+        if terminal_demand[j] > 0.0:
+            processing_costs += processing_cost[j] * terminal_demand[j]
+            dx = tx[j] - cx
+            dy = ty[j] - cy
+            center_to_terminal += math.sqrt(dx * dx + dy * dy) * terminal_demand[j]
+
+    return (fixed_costs, processing_costs,
+            center_to_terminal * transport_rate, terminal_to_consumer)
+
+
+def warmup():
+    """
+    Прогріває JIT-компіляцію ядер на мінімальних даних
+
+    Типи аргументів відповідають бойовим викликам (float32-масиви,
+    float32-скаляри координат центру), тому скомпільовані спеціалізації
+    потрапляють у дисковий кеш numba і повторно використовуються.
+    """
+    one = np.ones(1, dtype=np.float32)
+    active = np.ones(1, dtype=np.bool_)
+    zero32 = np.float32(0.0)
+    total_cost_components(np.zeros(1, dtype=np.int32), one, one, one, one,
+                          one, one, active, one, one, zero32, zero32, 1.0)
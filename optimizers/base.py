@@ -23,6 +23,7 @@ class Optimizer(ABC):
         self.network = network
         self.initial_cost = None
         self.final_cost = None
+        self.final_costs_breakdown = None
         self.optimization_history = []
 
     @abstractmethod
@@ -52,7 +53,10 @@ class Optimizer(ABC):
             'initial_cost': self.initial_cost,
             'final_cost': self.final_cost,
             'absolute_improvement': absolute_improvement,
-            'percentage_improvement': percentage_improvement
+            'percentage_improvement': percentage_improvement,
+            # Розбивка фінальних витрат з останнього обчислення
+            # оптимізатора — щоб виклики не перераховували її заново
+            'final_costs_breakdown': self.final_costs_breakdown
         }
 
     def print_results(self) -> None:
@@ -3,9 +3,13 @@
 Метод покоординатної оптимізації (МПО)
 """
 
-import copy
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
 from optimizers.base import Optimizer
+from optimizers.progress import BufferedProgress
+from models.element import Terminal
 from models.network import LogisticsNetwork
 
 
@@ -24,7 +28,9 @@ class CoordinateOptimizer(Optimizer):
         Args:
             network: Логістична мережа
             step_size: Розмір кроку для зміни координат
-            max_iterations: Максимальна кількість ітерацій
+            max_iterations: Максимальна кількість ітерацій — повних
+                проходів спуску (серія координатних кроків до стабілізації
+                плюс перевірка вимкнення терміналів), а не окремих кроків
             tolerance: Мінімальне покращення для продовження (%)
         """
         super().__init__(network)
@@ -32,12 +38,16 @@ class CoordinateOptimizer(Optimizer):
         self.max_iterations = max_iterations
         self.tolerance = tolerance
 
-    def optimize(self, verbose: bool = True) -> Dict[str, float]:
+    def optimize(self, verbose: bool = True,
+                 progress: BufferedProgress = None) -> Dict[str, float]:
         """
         Виконує оптимізацію методом покоординатного спуску
 
         Args:
             verbose: Виводити проміжні результати
+            progress: Буфер прогресу; за замовчуванням створюється
+                BufferedProgress(every=50), щоб не блокувати цикл на
+                синхронних print
 
         Returns:
             Словник з результатами оптимізації
@@ -46,6 +56,9 @@ class CoordinateOptimizer(Optimizer):
         self.initial_cost = self.network.calculate_costs()['total_cost']
         current_cost = self.initial_cost
 
+        if progress is None:
+            progress = BufferedProgress(every=50)
+
         if verbose:
             print(f"\n{'='*60}")
             print("ОПТИМІЗАЦІЯ МЕТОДОМ МПО")
@@ -59,24 +72,25 @@ class CoordinateOptimizer(Optimizer):
             iteration += 1
             improved = False
 
-            # Оптимізація координат кожного терміналу
-            for terminal in self.network.terminals:
-                if not terminal.is_active:
-                    continue
-
-                # Пробуємо оптимізувати позицію терміналу
-                new_cost = self._optimize_terminal_position(terminal, current_cost)
-
-                if new_cost < current_cost:
-                    improvement_pct = ((current_cost - new_cost) / current_cost) * 100
-                    if verbose:
-                        print(f"Ітерація {iteration}: Термінал {terminal.id} " +
-                              f"оптимізовано, покращення: {improvement_pct:.3f}%")
-                    current_cost = new_cost
-                    improved = True
+            # Повний прохід спуску: жадібні кроки за правилом
+            # Гаусса-Саутвелла (рухається координата з найбільшим
+            # |градієнтом|) повторюються до стабілізації позицій.
+            # Вимкнення терміналів перевіряється лише між проходами —
+            # рішення приймається на збіжних позиціях, а не посеред руху
+            while True:
+                new_cost, moved_terminal = self._greedy_coordinate_step(current_cost)
+                if not new_cost < current_cost:
+                    break
+                improvement_pct = ((current_cost - new_cost) / current_cost) * 100
+                if verbose:
+                    progress.log(f"Ітерація {iteration}: Термінал {moved_terminal.id} " +
+                                 f"оптимізовано, покращення: {improvement_pct:.3f}%")
+                current_cost = new_cost
+                improved = True
 
             # Перевірка на можливість вимкнути термінали
-            deactivated = self._try_deactivate_terminals(current_cost, verbose)
+            deactivated = self._try_deactivate_terminals(
+                current_cost, progress if verbose else None)
             if deactivated:
                 new_cost = self.network.calculate_costs()['total_cost']
                 if new_cost < current_cost:
@@ -86,17 +100,20 @@ class CoordinateOptimizer(Optimizer):
             # Якщо немає покращень, зупиняємо
             if not improved:
                 if verbose:
-                    print(f"\nНемає покращень на ітерації {iteration}. Зупинка.")
+                    progress.log(f"\nНемає покращень на ітерації {iteration}. Зупинка.")
                 break
 
             # Перевірка на мінімальне покращення
             improvement = ((self.initial_cost - current_cost) / self.initial_cost) * 100
             if improvement < self.tolerance:
                 if verbose:
-                    print(f"\nПокращення {improvement:.3f}% менше ніж tolerance {self.tolerance}%. Зупинка.")
+                    progress.log(f"\nПокращення {improvement:.3f}% менше ніж "
+                                 f"tolerance {self.tolerance}%. Зупинка.")
                 break
 
-        self.final_cost = current_cost
+        self.final_costs_breakdown = self.network.calculate_costs()
+        self.final_cost = self.final_costs_breakdown['total_cost']
+        progress.flush()
 
         if verbose:
             print(f"\n{'='*60}")
@@ -105,100 +122,229 @@ class CoordinateOptimizer(Optimizer):
 
         return self.get_improvement()
 
-    def _optimize_terminal_position(self, terminal, current_cost: float) -> float:
+    def _compute_gradients(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Оптимізує позицію одного терміналу
+        Обчислює часткові похідні витрат за координатами терміналів
 
-        Args:
-            terminal: Термінал для оптимізації
-            current_cost: Поточні витрати
+        Для терміналу j: ∂F/∂tx_j = r·[Σ_i demand_i·(tx_j-ux_i)/d_ij +
+        load_j·(tx_j-cx)/d_cj] по споживачах i, призначених j.
+        Зміна призначень при русі не враховується (евристика вибору).
 
         Returns:
-            Нові витрати після оптимізації
+            Кортеж (gx, gy) — градієнти по x та y для кожного терміналу
+        """
+        network = self.network
+        network._refresh_distance_cache()
+        arr = network.arrays
+        rate = network.cost_calculator.transport_cost_per_unit
+        n_terminals = len(arr.tx)
+        assigned = arr.assigned
+
+        gx = np.zeros(n_terminals)
+        gy = np.zeros(n_terminals)
+
+        # Внесок споживачів (транспорт термінал → споживач)
+        d = network._D[np.arange(len(arr.ux)), assigned].copy()
+        np.maximum(d, 1e-12, out=d)
+        np.add.at(gx, assigned, arr.demand * (arr.tx[assigned] - arr.ux) / d)
+        np.add.at(gy, assigned, arr.demand * (arr.ty[assigned] - arr.uy) / d)
+
+        # Внесок центру (транспорт центр → термінал)
+        load = np.bincount(assigned, weights=arr.demand, minlength=n_terminals)
+        d_center = np.hypot(arr.tx - arr.cx[0], arr.ty - arr.cy[0])
+        nonzero = d_center > 1e-12
+        gx[nonzero] += load[nonzero] * (arr.tx[nonzero] - arr.cx[0]) / d_center[nonzero]
+        gy[nonzero] += load[nonzero] * (arr.ty[nonzero] - arr.cy[0]) / d_center[nonzero]
+
+        gx *= rate
+        gy *= rate
+
+        # Неактивні термінали не рухаємо
+        gx[~arr.is_active] = 0.0
+        gy[~arr.is_active] = 0.0
+        return gx, gy
+
+    def _refresh_trial_cache(self) -> None:
         """
-        best_cost = current_cost
-        best_x, best_y = terminal.x, terminal.y
+        Перебудовує кеш для інкрементної оцінки пробних рухів
 
-        # Зберігаємо початкові координати
-        original_x, original_y = terminal.x, terminal.y
+        Зберігає для кожного споживача два найближчі активні термінали
+        (індекси та відстані) і поточні "вартості майданчика" терміналів
+        (обробка + транспорт від центру на одиницю попиту). Кеш дійсний,
+        доки стан мережі не змінився, тож оновлюється раз на крок —
+        перед серією пробних оцінок.
+        """
+        network = self.network
+        network._refresh_distance_cache()
+        arr = network.arrays
+        rate = network.cost_calculator.transport_cost_per_unit
+        n_consumers, n_terminals = network._D.shape
+
+        masked = network._D + network._active_penalty
+
+        rows = np.arange(n_consumers)
+        if n_terminals >= 2:
+            pair = np.argpartition(masked, 1, axis=1)[:, :2]
+            pair_d = masked[rows[:, None], pair]
+            first = pair_d.argmin(axis=1)
+            self._best_j = pair[rows, first].astype(np.int32)
+            self._second_j = pair[rows, 1 - first].astype(np.int32)
+            self._best_d = pair_d[rows, first]
+            self._second_d = pair_d[rows, 1 - first]
+        else:
+            self._best_j = np.zeros(n_consumers, dtype=np.int32)
+            self._second_j = self._best_j
+            self._best_d = masked[:, 0]
+            self._second_d = np.full(n_consumers, np.inf)
+
+        self._site_cost = arr.processing_cost + rate * np.hypot(
+            arr.tx - arr.cx[0], arr.ty - arr.cy[0])
+        self._fixed_active = float(arr.terminal_cost[arr.is_active].sum())
+
+    def _trial_costs_batch(self, j: int, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Оцінює витрати одразу для кількох пробних позицій терміналу j
 
-        # Пробуємо рухатись у 4 напрямках: вгору, вниз, вліво, вправо
-        directions = [
-            (self.step_size, 0),   # вправо
-            (-self.step_size, 0),  # вліво
-            (0, self.step_size),   # вгору
-            (0, -self.step_size),  # вниз
-        ]
+        Та сама інкрементна формула, що й у _trial_cost_move, але
+        розгорнута широкомовленням по кандидатах: одна матриця відстаней
+        (кандидати × споживачі) замість циклу по кандидатах у Python.
 
-        for dx, dy in directions:
-            # Пробуємо нову позицію
-            terminal.x = original_x + dx
-            terminal.y = original_y + dy
+        Args:
+            j: Індекс терміналу, що рухається
+            xs, ys: Масиви пробних координат
 
-            # Перерозподіляємо споживачів до найближчих терміналів
-            self.network.assign_consumers_to_terminals()
+        Returns:
+            Масив загальних витрат для кожного кандидата
+        """
+        network = self.network
+        arr = network.arrays
+        rate = network.cost_calculator.transport_cost_per_unit
+
+        d_new = np.hypot(arr.ux[None, :] - xs.astype(np.float32)[:, None],
+                         arr.uy[None, :] - ys.astype(np.float32)[:, None])
+        alt_d = np.where(self._best_j == j, self._second_d, self._best_d)
+        alt_t = np.where(self._best_j == j, self._second_j, self._best_j)
+        use_j = d_new < alt_d[None, :]
+        dist = np.where(use_j, d_new, alt_d[None, :])
+
+        site_j = arr.processing_cost[j] + rate * np.hypot(
+            xs - float(arr.cx[0]), ys - float(arr.cy[0]))
+        site_alt = arr.demand * self._site_cost[alt_t]
+
+        transport = np.sum(network._demand_x_rate[None, :] * dist,
+                           axis=1, dtype=np.float64)
+        demand_to_j = np.sum(use_j * arr.demand[None, :], axis=1, dtype=np.float64)
+        site_total = site_j * demand_to_j + np.sum(
+            ~use_j * site_alt[None, :], axis=1, dtype=np.float64)
+        return self._fixed_active + transport + site_total
+
+    def _greedy_coordinate_step(self, current_cost: float) -> Tuple[float, Optional[Terminal]]:
+        """
+        Один крок покоординатного спуску за правилом Гаусса-Саутвелла
 
-            # Обчислюємо нові витрати
-            new_cost = self.network.calculate_costs()['total_cost']
+        Координати перебираються у порядку спадання |градієнта|; для
+        обраної координати розмір кроку підбирається бектрекінгом,
+        починаючи з step_size.
 
-            # Якщо витрати менші, зберігаємо
-            if new_cost < best_cost:
-                best_cost = new_cost
-                best_x = terminal.x
-                best_y = terminal.y
+        Args:
+            current_cost: Поточні витрати
 
-        # Встановлюємо найкращу знайдену позицію
-        terminal.x = best_x
-        terminal.y = best_y
+        Returns:
+            Кортеж (нові витрати, термінал, що рухався) — якщо жоден рух
+            не покращив витрати, повертаються поточні витрати та None
+        """
+        gx, gy = self._compute_gradients()
+        self._refresh_trial_cache()
+        n_terminals = len(gx)
+        gradients = np.concatenate([gx, gy])
+        order = np.argsort(-np.abs(gradients))
+
+        for idx in order:
+            gradient = gradients[idx]
+            if gradient == 0.0:
+                break
 
-        # Якщо змінилась позиція, перерозподіляємо споживачів
-        if best_x != original_x or best_y != original_y:
-            self.network.assign_consumers_to_terminals()
+            j = idx % n_terminals
+            axis = idx // n_terminals  # 0 — x, 1 — y
+            terminal = self.network.terminals[j]
+            direction = -np.sign(gradient)
+
+            # Бектрекінг: кандидати step_size, step_size/2, ... оцінюються
+            # однією пакетною операцією; приймається перший (найбільший)
+            # крок, що покращує витрати
+            steps = direction * self.step_size / (2.0 ** np.arange(5))
+            if axis == 0:
+                xs = terminal.x + steps
+                ys = np.full(len(steps), terminal.y)
+            else:
+                xs = np.full(len(steps), terminal.x)
+                ys = terminal.y + steps
+
+            costs = self._trial_costs_batch(j, xs, ys)
+            better = np.flatnonzero(costs < current_cost)
+            if better.size:
+                g = int(better[0])
+                terminal.x = float(xs[g])
+                terminal.y = float(ys[g])
+                self.network.assign_consumers_to_terminals()
+                return float(costs[g]), terminal
 
-        return best_cost
+        return current_cost, None
 
-    def _try_deactivate_terminals(self, current_cost: float, verbose: bool = False) -> bool:
+    def _try_deactivate_terminals(self, current_cost: float,
+                                  progress: BufferedProgress = None) -> bool:
         """
         Перевіряє чи вигідно вимкнути якісь термінали
 
+        Замість пробного вимикання кожного терміналу з повним перерахунком
+        витрат зміна обчислюється аналітично за кешем top-2: вимкнення
+        терміналу k переводить його споживачів до других найближчих, тож
+        дельта — це економія фіксованих витрат мінус подорожчання цих
+        споживачів (дельта точна для одиничного вимкнення). Термінали
+        перебираються по одному у порядку списку, і після кожного
+        вимкнення кеш перебудовується — наступна дельта рахується вже від
+        нового стану. За виклик виконується один прохід: агресивніше
+        вимикання кількох терміналів без проміжної збіжності координат
+        залишає гірші кінцеві конфігурації.
+
         Args:
             current_cost: Поточні витрати
-            verbose: Виводити повідомлення
+            progress: Буфер прогресу для повідомлень (None — без виводу)
 
         Returns:
             True якщо хоча б один термінал було вимкнено
         """
+        network = self.network
+        arr = network.arrays
         deactivated = False
+        moved_cost = None
 
-        for terminal in self.network.terminals:
-            if not terminal.is_active:
+        for k, terminal in enumerate(network.terminals):
+            if not terminal.is_active or int(arr.is_active.sum()) <= 1:
                 continue
 
-            # Тимчасово вимикаємо термінал
-            terminal.is_active = False
-
-            # Перерозподіляємо споживачів
-            try:
-                self.network.assign_consumers_to_terminals()
-
-                # Обчислюємо нові витрати
-                new_cost = self.network.calculate_costs()['total_cost']
+            if moved_cost is None:
+                self._refresh_trial_cache()
+                # Подорожчання переходу кожного споживача до другого
+                # найближчого; inf у second_d (немає запасного) блокує
+                # вимкнення автоматично
+                moved_cost = (network._demand_x_rate * (self._second_d - self._best_d) +
+                              arr.demand * (self._site_cost[self._second_j] -
+                                            self._site_cost[self._best_j]))
+
+            delta = (float(moved_cost[self._best_j == k].sum()) -
+                     float(arr.terminal_cost[k]))
+            if not delta < 0.0:
+                continue
 
-                # Якщо витрати менші, залишаємо вимкненим
-                if new_cost < current_cost:
-                    if verbose:
-                        print(f"Термінал {terminal.id} вимкнено, покращення: " +
-                              f"{((current_cost - new_cost) / current_cost * 100):.3f}%")
-                    deactivated = True
-                    current_cost = new_cost
-                else:
-                    # Повертаємо назад
-                    terminal.is_active = True
-                    self.network.assign_consumers_to_terminals()
-
-            except ValueError:
-                # Якщо не можна вимкнути (немає інших активних терміналів), повертаємо назад
-                terminal.is_active = True
-                self.network.assign_consumers_to_terminals()
+            terminal.is_active = False
+            network.assign_consumers_to_terminals()
+            new_cost = current_cost + delta
+            if progress is not None:
+                progress.log(f"Термінал {terminal.id} вимкнено, покращення: " +
+                             f"{((current_cost - new_cost) / current_cost * 100):.3f}%")
+            current_cost = new_cost
+            deactivated = True
+            moved_cost = None
 
         return deactivated
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+Генетичний алгоритм оптимізації конфігурації терміналів (ЕМ-ГА)
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+
+from optimizers.base import Optimizer
+from optimizers._ga_kernel import eval_population
+from optimizers.progress import BufferedProgress
+from models.network import LogisticsNetwork
+
+
+class GeneticOptimizer(Optimizer):
+    """
+    Оптимізатор на основі генетичного алгоритму
+
+    Хромосома — бінарний вектор активності терміналів: ген j визначає,
+    чи працює термінал j. Координати терміналів не змінюються.
+    """
+
+    def __init__(self, network: LogisticsNetwork,
+                 population_size: int = 50,
+                 generations: int = 100,
+                 mutation_rate: float = 0.1,
+                 crossover_rate: float = 0.8,
+                 tournament_size: int = 3,
+                 seed: int = None,
+                 n_islands: int = 1,
+                 migration_interval: int = 20,
+                 migration_size: int = 3):
+        """
+        Ініціалізація ЕМ-ГА
+
+        Args:
+            network: Логістична мережа
+            population_size: Розмір популяції (кожного острова)
+            generations: Кількість поколінь
+            mutation_rate: Ймовірність мутації гена
+            crossover_rate: Ймовірність схрещування пари
+            tournament_size: Розмір турніру при відборі
+            seed: Зерно генератора випадкових чисел (для відтворюваності)
+            n_islands: Кількість незалежних підпопуляцій (1 — класичний ГА)
+            migration_interval: Поколінь між обмінами особинами островів
+            migration_size: Скільки найкращих особин мігрує з кожного острова
+        """
+        super().__init__(network)
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.tournament_size = tournament_size
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.chromosome_length = len(network.terminals)
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+
+        # Кеш витрат за генотипом: елітизм та відбір постійно повертають
+        # уже оцінені хромосоми (обмежений, FIFO-витіснення)
+        self._fitness_cache = {}
+
+        # Таблиці відстаней обчислюються один раз: термінали в ГА не
+        # рухаються, тож усі покоління читають ті самі масиви
+        network._refresh_distance_cache()
+        arr = network.arrays
+        self._D_tc = network._D
+        self._topk = network.get_topk_terminals()
+        self._d_center_terminal = np.hypot(arr.tx - arr.cx[0], arr.ty - arr.cy[0])
+        self._transport_rate = network.cost_calculator.transport_cost_per_unit
+
+    def optimize(self, verbose: bool = True,
+                 progress: BufferedProgress = None) -> Dict[str, float]:
+        """
+        Виконує оптимізацію генетичним алгоритмом
+
+        Пристосованість усього покоління обчислюється одним викликом
+        JIT-ядра eval_population (паралельно по хромосомах). При
+        n_islands > 1 незалежні підпопуляції еволюціонують у паралельних
+        процесах і кожні migration_interval поколінь обмінюються
+        найкращими особинами.
+
+        Args:
+            verbose: Виводити проміжні результати
+            progress: Буфер прогресу; за замовчуванням BufferedProgress(every=50)
+
+        Returns:
+            Словник з результатами оптимізації
+        """
+        self.initial_cost = self.network.calculate_costs()['total_cost']
+
+        if progress is None:
+            progress = BufferedProgress(every=50)
+
+        if verbose:
+            print(f"\n{'='*60}")
+            print("ОПТИМІЗАЦІЯ МЕТОДОМ ЕМ-ГА")
+            print(f"{'='*60}")
+            print(f"Початкові витрати: {self.initial_cost:,.2f}")
+            print(f"Параметри: популяція={self.population_size}, "
+                  f"поколінь={self.generations}, мутація={self.mutation_rate}, "
+                  f"островів={self.n_islands}")
+            print(f"{'='*60}\n")
+
+        if self.n_islands > 1:
+            best_chromosome = self._optimize_islands(verbose, progress)
+        else:
+            population = self._initialize_population()
+            _, _, _, best_chromosome = self._evolve(
+                population, self.generations,
+                progress=progress if verbose else None)
+
+        # Застосовуємо найкращу конфігурацію до мережі
+        self._apply_chromosome(best_chromosome)
+        self.final_costs_breakdown = self.network.calculate_costs()
+        self.final_cost = self.final_costs_breakdown['total_cost']
+        progress.flush()
+
+        if verbose:
+            print(f"\n{'='*60}")
+            print(f"Оптимізація завершена за {self.generations} поколінь")
+            print(f"{'='*60}")
+
+        return self.get_improvement()
+
+    def _evolve(self, population: np.ndarray, generations: int,
+                progress: BufferedProgress = None,
+                gen_offset: int = 0) -> Tuple[np.ndarray, np.ndarray, float, np.ndarray]:
+        """
+        Еволюціонує популяцію задану кількість поколінь
+
+        Args:
+            population: Початкова популяція — матриця (популяція, термінали)
+            generations: Кількість поколінь
+            progress: Буфер прогресу (None — без виводу)
+            gen_offset: Зсув нумерації поколінь у повідомленнях
+
+        Returns:
+            Кортеж (популяція, витрати останнього покоління,
+            найкращі витрати, найкраща хромосома)
+        """
+        best_chromosome = None
+        best_cost = float('inf')
+
+        # Подвійна буферизація: нащадки пишуться в запасну матрицю, після
+        # чого буфери міняються місцями — без алокацій у циклі поколінь
+        buffer = np.empty_like(population)
+
+        for generation in range(generations):
+            costs = self._population_costs(population)
+            fitness = 1.0 / (1.0 + costs)
+
+            gen_best = int(costs.argmin())
+            if costs[gen_best] < best_cost:
+                best_cost = float(costs[gen_best])
+                best_chromosome = population[gen_best].copy()
+
+            if progress is not None and (gen_offset + generation + 1) % 10 == 0:
+                progress.log(f"Покоління {gen_offset + generation + 1}: "
+                             f"найкращі витрати {best_cost:,.2f}")
+
+            # Нове покоління: елітизм + турнірний відбір + оператори.
+            # Переможці всіх турнірів покоління визначаються одним збором
+            n_pairs = self.population_size // 2
+            winners = self._tournament_winners(fitness, 2 * n_pairs)
+
+            buffer[0] = best_chromosome
+            filled = 1
+            for pair in range(n_pairs):
+                parent1 = population[winners[2 * pair]]
+                parent2 = population[winners[2 * pair + 1]]
+                child1, child2 = self._uniform_crossover(parent1, parent2)
+                buffer[filled] = self._mutate(child1)
+                filled += 1
+                if filled < self.population_size:
+                    buffer[filled] = self._mutate(child2)
+                    filled += 1
+
+            self._resample_duplicates(buffer)
+            population, buffer = buffer, population
+
+        # Нащадки останнього покоління оцінюються перед поверненням, щоб
+        # повернені витрати описували саме повернену популяцію (міграція
+        # островів заміщує найгірших за цими витратами), а не її батьків;
+        # повторні генотипи при цьому беруться з кешу
+        costs = self._population_costs(population)
+        gen_best = int(costs.argmin())
+        if costs[gen_best] < best_cost:
+            best_cost = float(costs[gen_best])
+            best_chromosome = population[gen_best].copy()
+
+        return population, costs, best_cost, best_chromosome
+
+    def _population_costs(self, population: np.ndarray) -> np.ndarray:
+        """
+        Повертає витрати для кожної хромосоми популяції
+
+        Спершу шукає генотипи в кеші за упакованим байтовим ключем;
+        JIT-ядро викликається лише для ще не бачених хромосом. Елітна
+        хромосома та повторно відібрані батьки повертаються з кешу без
+        переобчислення.
+        """
+        arr = self.network.arrays
+        packed = np.packbits(population, axis=1)
+        keys = [packed[p].tobytes() for p in range(len(population))]
+
+        costs = np.empty(len(population))
+        misses = []
+        for p, key in enumerate(keys):
+            cached = self._fitness_cache.get(key)
+            if cached is None:
+                misses.append(p)
+            else:
+                costs[p] = cached
+        if misses:
+            new_costs = eval_population(population[misses], self._D_tc,
+                                        self._topk, self._d_center_terminal,
+                                        arr.demand,
+                                        self.network._demand_x_rate,
+                                        arr.terminal_cost,
+                                        arr.processing_cost,
+                                        self._transport_rate)
+            costs[misses] = new_costs
+            limit = 10 * self.population_size
+            for p in misses:
+                if len(self._fitness_cache) >= limit:
+                    self._fitness_cache.pop(next(iter(self._fitness_cache)))
+                self._fitness_cache[keys[p]] = float(costs[p])
+        return costs
+
+    def _optimize_islands(self, verbose: bool,
+                          progress: BufferedProgress) -> np.ndarray:
+        """
+        Острівна модель: підпопуляції еволюціонують паралельно
+
+        Кожен острів — незалежний ГА у власному процесі. Еволюція йде
+        епохами по migration_interval поколінь; між епохами найкращі
+        особини всіх островів збираються разом і заміщують найгірших на
+        кожному острові. Розклад детермінований, тому результат
+        відтворюваний при фіксованому seed.
+
+        Returns:
+            Найкраща хромосома серед усіх островів
+        """
+        populations = [self._initialize_population() for _ in range(self.n_islands)]
+        best_cost = float('inf')
+        best_chromosome = None
+
+        epoch = 0
+        for start in range(0, self.generations, self.migration_interval):
+            gens = min(self.migration_interval, self.generations - start)
+            seeds = [self._random.randrange(2 ** 32) for _ in range(self.n_islands)]
+
+            with ProcessPoolExecutor(max_workers=self.n_islands) as executor:
+                futures = [
+                    executor.submit(_evolve_island, self.network,
+                                    self._island_params(), populations[i],
+                                    gens, seeds[i])
+                    for i in range(self.n_islands)
+                ]
+                results = [f.result() for f in futures]
+
+            # Міграція: чемпіони найкращих островів заміщують найгірших
+            # особин кожного острова (за витратами останнього покоління)
+            champions = []
+            for i, (population, costs, island_best, island_chromosome) in enumerate(results):
+                populations[i] = population
+                champions.append((island_best, island_chromosome))
+                if island_best < best_cost:
+                    best_cost = island_best
+                    best_chromosome = island_chromosome
+
+            champions.sort(key=lambda item: item[0])
+            migrants = [chromosome for _, chromosome in champions[:self.migration_size]]
+            for i, (population, costs, _, _) in enumerate(results):
+                worst = np.argsort(costs)[::-1]
+                for slot, migrant in zip(worst, migrants):
+                    populations[i][int(slot)] = migrant.copy()
+
+            epoch += 1
+            if verbose:
+                progress.log(f"Епоха {epoch} ({start + gens} поколінь): "
+                             f"найкращі витрати {best_cost:,.2f}")
+
+        return best_chromosome
+
+    def _island_params(self) -> Dict:
+        """Параметри для відтворення оптимізатора у воркер-процесі"""
+        return {
+            'population_size': self.population_size,
+            'generations': self.generations,
+            'mutation_rate': self.mutation_rate,
+            'crossover_rate': self.crossover_rate,
+            'tournament_size': self.tournament_size,
+        }
+
+    def _initialize_population(self) -> np.ndarray:
+        """Створює початкову популяцію — матрицю випадкових хромосом"""
+        population = self._rng.integers(0, 2,
+                                        size=(self.population_size,
+                                              self.chromosome_length),
+                                        dtype=np.int8)
+        self._repair_zero_rows(population)
+        return population
+
+    def _ensure_valid(self, chromosome: np.ndarray) -> np.ndarray:
+        """Гарантує, що хромосома має хоча б один активний термінал"""
+        if not chromosome.any():
+            chromosome[self._random.randrange(self.chromosome_length)] = 1
+        return chromosome
+
+    def _repair_zero_rows(self, population: np.ndarray) -> None:
+        """
+        Вмикає випадковий термінал у всіх порожніх хромосомах матриці
+
+        Пакетний аналог _ensure_valid: одна SIMD-редукція any по рядках
+        та один розіграш позицій замість перевірки кожної хромосоми в
+        Python-циклі.
+        """
+        zero_rows = np.flatnonzero(~population.any(axis=1))
+        if zero_rows.size:
+            population[zero_rows,
+                       self._rng.integers(0, self.chromosome_length,
+                                          size=zero_rows.size)] = 1
+
+    def _resample_duplicates(self, population: np.ndarray) -> None:
+        """
+        Заміщує повторювані генотипи покоління випадковими хромосомами
+
+        Дублікати виявляються за упакованим бітовим поданням (ті ж ключі,
+        що й у кеші витрат); перше входження кожного генотипу — зокрема
+        елітна хромосома в рядку 0 — зберігається, решта пересемплюється,
+        щоб не витрачати оцінки пристосованості на копії та не втрачати
+        різноманіття передчасно.
+        """
+        packed = np.packbits(population, axis=1)
+        _, first = np.unique(packed, axis=0, return_index=True)
+        duplicates = np.setdiff1d(np.arange(len(population)), first,
+                                  assume_unique=True)
+        if duplicates.size:
+            population[duplicates] = self._rng.integers(
+                0, 2, size=(duplicates.size, self.chromosome_length),
+                dtype=np.int8)
+            self._repair_zero_rows(population)
+
+    def _tournament_winners(self, fitness: np.ndarray,
+                            n_selections: int) -> np.ndarray:
+        """
+        Турнірний відбір: індекси переможців n_selections турнірів
+
+        Учасники всіх турнірів розігруються одним rng.integers, переможці
+        визначаються одним argmax по зібраних пристосованостях.
+        """
+        contestants = self._rng.integers(0, self.population_size,
+                                         size=(n_selections, self.tournament_size))
+        return contestants[np.arange(n_selections),
+                           fitness[contestants].argmax(axis=1)]
+
+    def _uniform_crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> tuple:
+        """Рівномірне схрещування двох батьківських хромосом"""
+        if self._random.random() > self.crossover_rate:
+            return parent1.copy(), parent2.copy()
+
+        # Одна булева маска вирішує, який з батьків віддає кожен ген
+        mask = self._rng.random(self.chromosome_length) < 0.5
+        child1 = np.where(mask, parent1, parent2)
+        child2 = np.where(mask, parent2, parent1)
+        return self._ensure_valid(child1), self._ensure_valid(child2)
+
+    def _mutate(self, chromosome: np.ndarray) -> np.ndarray:
+        """Бітова мутація хромосоми"""
+        flips = self._rng.random(self.chromosome_length) < self.mutation_rate
+        mutated = chromosome ^ flips.astype(np.int8)
+        return self._ensure_valid(mutated)
+
+    def _apply_chromosome(self, chromosome: np.ndarray) -> None:
+        """
+        Застосовує хромосому до мережі: активність терміналів + призначення
+
+        Якщо набір активних терміналів уже збігається з хромосомою,
+        переприв'язка споживачів не виконується — чинні призначення
+        лишаються коректними.
+        """
+        changed = False
+        for j, terminal in enumerate(self.network.terminals):
+            active = bool(chromosome[j])
+            if terminal.is_active != active:
+                terminal.is_active = active
+                changed = True
+        if changed:
+            self.network.assign_consumers_to_terminals()
+
+
+def _evolve_island(network: LogisticsNetwork, params: Dict,
+                   population: np.ndarray, generations: int,
+                   seed: int) -> Tuple[np.ndarray, np.ndarray, float, np.ndarray]:
+    """
+    Еволюціонує один острів у воркер-процесі
+
+    Функція модульного рівня, щоб її можна було передати у воркер-процес;
+    мережа потрапляє до воркера власною копією через серіалізацію.
+    """
+    optimizer = GeneticOptimizer(network, seed=seed, **params)
+    return optimizer._evolve(population, generations)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Буферизований вивід прогресу оптимізації
+"""
+
+import sys
+from typing import List
+
+
+class BufferedProgress:
+    """
+    Накопичує рядки прогресу та скидає їх у stdout пакетами
+
+    Синхронний print на кожній ітерації — це окремий syscall із
+    блокуванням на flush терміналу; буферизація прибирає ці паузи з
+    критичного шляху оптимізатора.
+    """
+
+    def __init__(self, every: int = 100):
+        """
+        Args:
+            every: Скидати буфер після кожних `every` повідомлень
+        """
+        self.every = every
+        self.buf: List[str] = []
+
+    def log(self, message: str) -> None:
+        """Додає повідомлення до буфера, за потреби скидає його"""
+        self.buf.append(message)
+        if len(self.buf) >= self.every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Виводить накопичені повідомлення одним записом"""
+        if self.buf:
+            sys.stdout.write('\n'.join(self.buf) + '\n')
+            self.buf.clear()
@@ -3,9 +3,13 @@
 Обчислення витрат логістичної мережі
 """
 
+import operator
 from typing import List, Dict, Tuple
-from models.element import Center, Terminal, Consumer
-from services.distance import euclidean_distance
+
+import numpy as np
+
+from models.element import Center, Terminal, Consumer, NetworkArrays
+from optimizers._kernels import total_cost_components
 
 
 class CostCalculator:
@@ -22,6 +26,31 @@ class CostCalculator:
         """
         self.transport_cost_per_unit = transport_cost_per_unit
 
+        # Кеш тарифів терміналів: масиви атрибутів будуються один раз на
+        # список терміналів і спільні для всіх об'єктних методів
+        self._cached_terminals = None
+        self._fixed = None
+        self._proc = None
+
+    def _terminal_cost_arrays(self, terminals: List[Terminal]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Повертає масиви (terminal_cost, processing_cost) для списку терміналів
+
+        Тарифи терміналів незмінні, тому масиви будуються один раз через
+        attrgetter і кешуються за ідентичністю списку; новий список
+        (інша мережа) інвалідує кеш.
+        """
+        if self._cached_terminals is not terminals:
+            n_terminals = len(terminals)
+            self._fixed = np.fromiter(
+                map(operator.attrgetter('terminal_cost'), terminals),
+                dtype=np.float64, count=n_terminals)
+            self._proc = np.fromiter(
+                map(operator.attrgetter('processing_cost'), terminals),
+                dtype=np.float64, count=n_terminals)
+            self._cached_terminals = terminals
+        return self._fixed, self._proc
+
     def calculate_terminal_fixed_costs(self, terminals: List[Terminal]) -> float:
         """
         Обчислює фіксовані витрати на утримання активних терміналів
@@ -32,9 +61,12 @@ class CostCalculator:
         Returns:
             Загальна вартість утримання активних терміналів
         """
-        return sum(t.terminal_cost for t in terminals if t.is_active)
+        fixed, _ = self._terminal_cost_arrays(terminals)
+        active = np.fromiter(map(operator.attrgetter('is_active'), terminals),
+                             dtype=np.bool_, count=len(terminals))
+        return float(fixed[active].sum())
 
-    def calculate_processing_costs(self, terminals: List[Terminal], 
+    def calculate_processing_costs(self, terminals: List[Terminal],
                                    consumers: List[Consumer]) -> float:
         """
         Обчислює витрати на обробку товарів у терміналах
@@ -46,21 +78,23 @@ class CostCalculator:
         Returns:
             Загальна вартість обробки
         """
-        total_cost = 0.0
-
-        # Групуємо споживачів за терміналами
-        for terminal in terminals:
-            if not terminal.is_active:
-                continue
-
-            # Знаходимо всіх споживачів для цього терміналу
-            terminal_consumers = [c for c in consumers if c.assigned_terminal == terminal.id]
-
-            # Обчислюємо вартість обробки
-            total_demand = sum(c.demand for c in terminal_consumers)
-            total_cost += terminal.processing_cost * total_demand
-
-        return total_cost
+        _, proc = self._terminal_cost_arrays(terminals)
+        tid_to_idx = {t.id: j for j, t in enumerate(terminals)}
+
+        # Попит групується за терміналами одним bincount замість
+        # квадратичного фільтра споживачів усередині циклу терміналів
+        assigned_pairs = [(tid_to_idx[c.assigned_terminal], c.demand)
+                          for c in consumers if c.assigned_terminal is not None]
+        assigned = np.fromiter((j for j, _ in assigned_pairs), dtype=np.intp,
+                               count=len(assigned_pairs))
+        demand = np.fromiter((d for _, d in assigned_pairs), dtype=np.float64,
+                             count=len(assigned_pairs))
+        per_terminal_demand = np.bincount(assigned, weights=demand,
+                                          minlength=len(terminals))
+
+        active = np.fromiter(map(operator.attrgetter('is_active'), terminals),
+                             dtype=np.bool_, count=len(terminals))
+        return float((proc * per_terminal_demand)[active].sum())
 
     def calculate_transportation_costs(self, center: Center, terminals: List[Terminal],
                                        consumers: List[Consumer]) -> Tuple[float, float, float]:
@@ -75,30 +109,38 @@ class CostCalculator:
         Returns:
             Кортеж (center_to_terminal_cost, terminal_to_consumer_cost, total_cost)
         """
-        center_to_terminal_cost = 0.0
-        terminal_to_consumer_cost = 0.0
-
-        for terminal in terminals:
-            if not terminal.is_active:
-                continue
-
-            # Знаходимо споживачів для цього терміналу
-            terminal_consumers = [c for c in consumers if c.assigned_terminal == terminal.id]
-
-            if not terminal_consumers:
-                continue
-
-            # Загальний попит для цього терміналу
-            total_demand = sum(c.demand for c in terminal_consumers)
-
-            # Вартість Center → Terminal
-            distance_center_terminal = euclidean_distance(center, terminal)
-            center_to_terminal_cost += distance_center_terminal * self.transport_cost_per_unit * total_demand
-
-            # Вартість Terminal → Consumers
-            for consumer in terminal_consumers:
-                distance_terminal_consumer = euclidean_distance(terminal, consumer)
-                terminal_to_consumer_cost += distance_terminal_consumer * self.transport_cost_per_unit * consumer.demand
+        n_terminals = len(terminals)
+        tid_to_idx = {t.id: j for j, t in enumerate(terminals)}
+
+        # Координати та попит витягуються зі списків об'єктів один раз —
+        # далі всі відстані рахуються NumPy-редукціями без isinstance-
+        # диспетчеризації euclidean_distance на кожній парі
+        tx = np.fromiter((t.x for t in terminals), dtype=np.float64, count=n_terminals)
+        ty = np.fromiter((t.y for t in terminals), dtype=np.float64, count=n_terminals)
+        active = np.fromiter((t.is_active for t in terminals), dtype=np.bool_,
+                             count=n_terminals)
+
+        assigned_pairs = [(tid_to_idx[c.assigned_terminal], c)
+                          for c in consumers if c.assigned_terminal is not None]
+        assigned = np.fromiter((j for j, _ in assigned_pairs), dtype=np.intp,
+                               count=len(assigned_pairs))
+        ux = np.fromiter((c.x for _, c in assigned_pairs), dtype=np.float64,
+                         count=len(assigned_pairs))
+        uy = np.fromiter((c.y for _, c in assigned_pairs), dtype=np.float64,
+                         count=len(assigned_pairs))
+        demand = np.fromiter((c.demand for _, c in assigned_pairs), dtype=np.float64,
+                             count=len(assigned_pairs))
+
+        served = active[assigned]
+        terminal_to_consumer_cost = float(np.sum(
+            np.hypot(tx[assigned] - ux, ty[assigned] - uy)[served]
+            * demand[served]) * self.transport_cost_per_unit)
+
+        per_terminal_demand = np.bincount(assigned[served], weights=demand[served],
+                                          minlength=n_terminals)
+        center_to_terminal_cost = float(np.sum(
+            np.hypot(tx - center.x, ty - center.y) * per_terminal_demand
+        ) * self.transport_cost_per_unit)
 
         total_cost = center_to_terminal_cost + terminal_to_consumer_cost
         return center_to_terminal_cost, terminal_to_consumer_cost, total_cost
@@ -138,6 +180,45 @@ class CostCalculator:
             'total_cost': total_cost
         }
 
+    def calculate_total_cost_arrays(self, arrays: NetworkArrays,
+                                    weight: np.ndarray = None) -> Dict[str, float]:
+        """
+        Обчислює загальні витрати мережі на SoA-масивах
+
+        Векторизований еквівалент calculate_total_cost: замість обходу
+        Python-об'єктів усі доданки обчислюються NumPy-редукціями.
+
+        Args:
+            arrays: SoA-представлення мережі з актуальним arrays.assigned
+            weight: Попередньо обчислене demand * transport_cost_per_unit
+                (None — обчислюється на місці)
+
+        Returns:
+            Словник з детальною розбивкою витрат (ті ж ключі, що й у
+            calculate_total_cost)
+        """
+        if weight is None:
+            weight = arrays.demand * np.float32(self.transport_cost_per_unit)
+
+        fixed_costs, processing_costs, center_to_terminal, terminal_to_consumer = \
+            total_cost_components(
+                arrays.assigned, arrays.ux, arrays.uy, arrays.demand, weight,
+                arrays.tx, arrays.ty, arrays.is_active,
+                arrays.terminal_cost, arrays.processing_cost,
+                arrays.cx[0], arrays.cy[0], self.transport_cost_per_unit)
+
+        transport_total = center_to_terminal + terminal_to_consumer
+        total_cost = fixed_costs + processing_costs + transport_total
+
+        return {
+            'fixed_costs': fixed_costs,
+            'processing_costs': processing_costs,
+            'transport_center_to_terminal': center_to_terminal,
+            'transport_terminal_to_consumer': terminal_to_consumer,
+            'transport_total': transport_total,
+            'total_cost': total_cost
+        }
+
     def print_cost_breakdown(self, costs: Dict[str, float]) -> None:
         """
         Виводить детальну розбивку витрат
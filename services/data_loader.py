@@ -4,7 +4,20 @@
 """
 
 import csv
+import functools
+import os
+from pathlib import Path
 from typing import List, Tuple
+
+import numpy as np
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    pd = None
+    PANDAS_AVAILABLE = False
+
 from models.element import Center, Terminal, Consumer, Element
 
 
@@ -15,15 +28,103 @@ def load_network_from_csv(file_path: str) -> Tuple[List[Center], List[Terminal],
     Формат CSV:
     id,x,y,type,demand,terminal_cost,processing_cost
 
+    Результат парсингу мемоізується за (шлях, mtime) у пам'яті та в
+    .npz-кеші поруч із файлом, тому повторні запуски на тих самих даних
+    минають розбір CSV. Об'єкти елементів створюються заново при кожному
+    виклику — спільного змінюваного стану між викликами немає.
+
     Args:
         file_path: Шлях до CSV файлу
 
     Returns:
         Кортеж з трьох списків: (центри, термінали, споживачі)
     """
-    centers = []
-    terminals = []
-    consumers = []
+    # Ключ — mtime у наносекундах: округлення до секунд пропускало
+    # зміни файлу, що відбулись у ту саму секунду, і віддавало старі дані
+    mtime = os.stat(file_path).st_mtime_ns
+    raw = _load_raw_cached(os.fspath(file_path), mtime)
+
+    centers = [Center(id=int(i), x=float(x), y=float(y))
+               for i, x, y in zip(*raw[0])]
+    terminals = [Terminal(id=int(i), x=float(x), y=float(y),
+                          terminal_cost=float(tc), processing_cost=float(pc))
+                 for i, x, y, tc, pc in zip(*raw[1])]
+    consumers = [Consumer(id=int(i), x=float(x), y=float(y), demand=float(d))
+                 for i, x, y, d in zip(*raw[2])]
+    return centers, terminals, consumers
+
+
+@functools.lru_cache(maxsize=8)
+def _load_raw_cached(file_path: str, mtime: int) -> tuple:
+    """
+    Повертає сирі масиви мережі, використовуючи .npz-кеш на диску
+
+    Ключ кешу містить mtime (наносекунди): після зміни CSV старий запис
+    не підходить і файл розбирається заново; застарілі записи того ж CSV
+    прибираються при записі нового.
+    """
+    cache_path = Path(file_path).parent / '.cache' / f'{Path(file_path).stem}.{mtime}.npz'
+    if cache_path.exists():
+        data = np.load(cache_path)
+        return (
+            (data['center_id'], data['center_x'], data['center_y']),
+            (data['terminal_id'], data['terminal_x'], data['terminal_y'],
+             data['terminal_cost'], data['processing_cost']),
+            (data['consumer_id'], data['consumer_x'], data['consumer_y'], data['demand']),
+        )
+
+    raw = _parse_csv(file_path)
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        # Записи з попередніми mtime цього ж CSV уже ніколи не збіжаться
+        # з ключем — видаляються, щоб кеш не накопичував мертві файли
+        for stale in cache_path.parent.glob(f'{Path(file_path).stem}.*.npz'):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        np.savez(cache_path,
+                 center_id=raw[0][0], center_x=raw[0][1], center_y=raw[0][2],
+                 terminal_id=raw[1][0], terminal_x=raw[1][1], terminal_y=raw[1][2],
+                 terminal_cost=raw[1][3], processing_cost=raw[1][4],
+                 consumer_id=raw[2][0], consumer_x=raw[2][1], consumer_y=raw[2][2],
+                 demand=raw[2][3])
+    except OSError:
+        # Кеш — лише прискорення; не зривати завантаження через диск
+        pass
+    return raw
+
+
+def _parse_csv(file_path: str) -> tuple:
+    """
+    Розбирає CSV у кортежі NumPy-масивів за типами елементів
+
+    За наявності pandas розбір та конвертація чисел виконуються на
+    C-рівні одним read_csv; інакше — резервний шлях через csv.DictReader.
+    """
+    if PANDAS_AVAILABLE:
+        df = pd.read_csv(file_path)
+        element_type = df['type'].str.lower()
+
+        centers = df[element_type == 'center']
+        terminals = df[element_type == 'terminal']
+        consumers = df[element_type == 'consumer']
+        return (
+            (centers['id'].to_numpy(np.int64),
+             centers['x'].to_numpy(np.float64),
+             centers['y'].to_numpy(np.float64)),
+            (terminals['id'].to_numpy(np.int64),
+             terminals['x'].to_numpy(np.float64),
+             terminals['y'].to_numpy(np.float64),
+             terminals['terminal_cost'].to_numpy(np.float64),
+             terminals['processing_cost'].to_numpy(np.float64)),
+            (consumers['id'].to_numpy(np.int64),
+             consumers['x'].to_numpy(np.float64),
+             consumers['y'].to_numpy(np.float64),
+             consumers['demand'].to_numpy(np.float64)),
+        )
+
+    centers = ([], [], [])
+    terminals = ([], [], [], [], [])
+    consumers = ([], [], [], [])
 
     with open(file_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -35,28 +136,61 @@ def load_network_from_csv(file_path: str) -> Tuple[List[Center], List[Terminal],
             element_type = row['type'].lower()
 
             if element_type == 'center':
-                centers.append(Center(id=element_id, x=x, y=y))
+                centers[0].append(element_id)
+                centers[1].append(x)
+                centers[2].append(y)
 
             elif element_type == 'terminal':
-                terminal_cost = float(row['terminal_cost'])
-                processing_cost = float(row['processing_cost'])
-                terminals.append(Terminal(
-                    id=element_id,
-                    x=x,
-                    y=y,
-                    terminal_cost=terminal_cost,
-                    processing_cost=processing_cost
-                ))
+                terminals[0].append(element_id)
+                terminals[1].append(x)
+                terminals[2].append(y)
+                terminals[3].append(float(row['terminal_cost']))
+                terminals[4].append(float(row['processing_cost']))
 
             elif element_type == 'consumer':
-                demand = float(row['demand'])
-                consumers.append(Consumer(
-                    id=element_id,
-                    x=x,
-                    y=y,
-                    demand=demand
-                ))
+                consumers[0].append(element_id)
+                consumers[1].append(x)
+                consumers[2].append(y)
+                consumers[3].append(float(row['demand']))
+
+    return (tuple(np.asarray(c) for c in centers),
+            tuple(np.asarray(t) for t in terminals),
+            tuple(np.asarray(c) for c in consumers))
+
+
+def load_network_from_npz(file_path: str) -> Tuple[List[Center], List[Terminal], List[Consumer]]:
+    """
+    Завантажує мережу з бінарного .npz (NetworkGenerator.save_to_npz)
+
+    Стовпці читаються готовими масивами — без розбору тексту та
+    конвертації поле за полем; коди типів: 0 — центр, 1 — термінал,
+    2 — споживач.
+
+    Args:
+        file_path: Шлях до .npz файлу
+
+    Returns:
+        Кортеж з трьох списків: (центри, термінали, споживачі)
+    """
+    data = np.load(file_path)
+    ids, xs, ys = data['id'], data['x'], data['y']
+    types = data['type']
+
+    center_mask = types == 0
+    terminal_mask = types == 1
+    consumer_mask = types == 2
 
+    centers = [Center(id=int(i), x=float(x), y=float(y))
+               for i, x, y in zip(ids[center_mask], xs[center_mask], ys[center_mask])]
+    terminals = [Terminal(id=int(i), x=float(x), y=float(y),
+                          terminal_cost=float(tc), processing_cost=float(pc))
+                 for i, x, y, tc, pc in zip(
+                     ids[terminal_mask], xs[terminal_mask], ys[terminal_mask],
+                     data['terminal_cost'][terminal_mask],
+                     data['processing_cost'][terminal_mask])]
+    consumers = [Consumer(id=int(i), x=float(x), y=float(y), demand=float(d))
+                 for i, x, y, d in zip(ids[consumer_mask], xs[consumer_mask],
+                                       ys[consumer_mask], data['demand'][consumer_mask])]
     return centers, terminals, consumers
 
 
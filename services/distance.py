@@ -29,7 +29,8 @@ def euclidean_distance(elem1: Union[Element, tuple], elem2: Union[Element, tuple
     else:
         x2, y2 = elem2
 
-    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    # math.hypot — одна C-функція без проміжних піднесень до степеня
+    return math.hypot(x2 - x1, y2 - y1)
 
 
 def manhattan_distance(elem1: Union[Element, tuple], elem2: Union[Element, tuple]) -> float:
@@ -75,13 +76,16 @@ def find_nearest_terminal(consumer: Consumer, terminals: list, active_only: bool
     if not available_terminals:
         raise ValueError("Немає доступних терміналів")
 
+    cx, cy = consumer.x, consumer.y
     nearest = None
-    min_distance = float('inf')
+    min_d2 = float('inf')
 
+    # Для argmin достатньо квадратів відстаней — sqrt береться один раз
+    # наприкінці, а не на кожній парі
     for terminal in available_terminals:
-        distance = euclidean_distance(consumer, terminal)
-        if distance < min_distance:
-            min_distance = distance
+        d2 = (terminal.x - cx) ** 2 + (terminal.y - cy) ** 2
+        if d2 < min_d2:
+            min_d2 = d2
             nearest = terminal
 
-    return nearest, min_distance
+    return nearest, math.sqrt(min_d2)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Експорт результатів оптимізації у CSV-файли
+"""
+
+import atexit
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from models.network import LogisticsNetwork
+
+# Схема рядка фіксована, тому рядки формуються одним str.format без
+# диспетчеризації csv-модуля; лапки — лише навколо текстових полів
+_FIELDNAMES = ('timestamp', 'dataset', 'method', 'initial_cost', 'final_cost',
+               'absolute_improvement', 'percentage_improvement',
+               'execution_time_s', 'active_terminals_before',
+               'active_terminals_after', 'terminals_config_before',
+               'terminals_config_after')
+_HEADER_LINE = ','.join(_FIELDNAMES) + '\n'
+_ROW_FMT = ('"{timestamp}","{dataset}","{method}",{initial_cost},{final_cost},'
+            '{absolute_improvement},{percentage_improvement},'
+            '{execution_time_s},{active_terminals_before},'
+            '{active_terminals_after},"{terminals_config_before}",'
+            '"{terminals_config_after}"\n')
+
+
+def _csv_safe(value: str) -> str:
+    """Екранує лапки у текстовому полі CSV (само поле береться в лапки)"""
+    return value.replace('"', '""')
+
+
+# BOM для Excel-сумісних файлів пишеться як готові байти: файли
+# відкриваються у бінарному режимі без TextIOWrapper-кодування на запис
+_BOM = b'\xef\xbb\xbf'
+
+def _terminals_config(network: 'LogisticsNetwork') -> str:
+    """
+    Кодує конфігурацію терміналів одним рядком виду T1:ON(20.0,30.0);...
+
+    Форматування йде по SoA-масивах мережі через np.char: координати й
+    статуси всіх терміналів конвертуються в рядки пакетно, без виклику
+    float.__format__ на кожну координату.
+    """
+    arr = network.arrays
+    arr.sync_terminals(network.terminals)
+    ids = np.fromiter((t.id for t in network.terminals), dtype=np.int64,
+                      count=len(network.terminals))
+    parts = np.char.add(
+        np.char.add(np.char.mod('T%d:', ids),
+                    np.where(arr.is_active, 'ON', 'OFF')),
+        np.char.add(np.char.mod('(%.1f', arr.tx.astype(np.float64)),
+                    np.char.mod(',%.1f)', arr.ty.astype(np.float64))))
+    return ';'.join(parts)
+
+
+class ResultsExporter:
+    """
+    Експортер результатів оптимізації
+
+    Формує CSV-звіти за окремими запусками, порівняннями методів та веде
+    накопичувальний журнал експериментів. Журнал може тримати файл
+    відкритим між записами (open_log/close_log) — корисно для серій
+    експериментів, де рядки додаються в циклі.
+    """
+
+    def __init__(self, results_dir: str = 'results'):
+        """
+        Ініціалізація експортера
+
+        Args:
+            results_dir: Каталог для файлів результатів
+        """
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(exist_ok=True)
+        self._log_fh = None
+
+        # Накопичувач рядків журналу: без відкритого дескриптора рядки
+        # збираються пакетами і скидаються одним записом
+        self._log_buffer = []
+        self._log_flush_every = 64
+        self._log_filename = 'experiments_log.csv'
+        atexit.register(self.close_log)
+
+    def _prepare_single_row(self, network_before: LogisticsNetwork,
+                            network_after: LogisticsNetwork,
+                            results: Dict[str, float], method_name: str,
+                            dataset_name: str, execution_time: float,
+                            timestamp: str) -> Dict[str, object]:
+        """
+        Готує один рядок звіту за запуском оптимізації
+
+        Args:
+            network_before: Мережа до оптимізації
+            network_after: Мережа після оптимізації
+            results: Результати get_improvement() оптимізатора
+            method_name: Назва методу ('МПО', 'ЕМ-ГА')
+            dataset_name: Назва набору даних
+            execution_time: Час виконання, с
+            timestamp: Часова мітка запису (одна на виклик експорту)
+
+        Returns:
+            Словник зі значеннями колонок звіту
+        """
+        # Кількість активних — з SoA-маски мережі, без обходу об'єктів
+        active_before = network_before.get_active_terminal_count()
+        active_after = network_after.get_active_terminal_count()
+
+        config_before = _terminals_config(network_before)
+        config_after = _terminals_config(network_after)
+
+        return {
+            'timestamp': timestamp,
+            'dataset': _csv_safe(dataset_name),
+            'method': _csv_safe(method_name),
+            'initial_cost': f"{results['initial_cost']:.2f}",
+            'final_cost': f"{results['final_cost']:.2f}",
+            'absolute_improvement': f"{results['absolute_improvement']:.2f}",
+            'percentage_improvement': f"{results['percentage_improvement']:.2f}",
+            'execution_time_s': f"{execution_time:.3f}",
+            'active_terminals_before': active_before,
+            'active_terminals_after': active_after,
+            'terminals_config_before': config_before,
+            'terminals_config_after': config_after,
+        }
+
+    def export_single_optimization(self, network_before: LogisticsNetwork,
+                                   network_after: LogisticsNetwork,
+                                   results: Dict[str, float], method_name: str,
+                                   dataset_name: str, execution_time: float,
+                                   filename: Optional[str] = None) -> Path:
+        """
+        Експортує результати одного запуску оптимізації у CSV
+
+        Returns:
+            Шлях до створеного файлу
+        """
+        # Один виклик datetime.now() і на ім'я файлу, і на рядок звіту
+        now = datetime.now()
+        if filename is None:
+            filename = f"optimization_{now.strftime('%Y%m%d_%H%M%S')}.csv"
+        filepath = self.results_dir / filename
+
+        row = self._prepare_single_row(network_before, network_after, results,
+                                       method_name, dataset_name, execution_time,
+                                       now.strftime('%Y-%m-%d %H:%M:%S'))
+        with open(filepath, 'wb') as f:
+            f.write(_BOM + (_HEADER_LINE + _ROW_FMT.format_map(row)).encode('utf-8'))
+        return filepath
+
+    def export_comparison(self, network_before: LogisticsNetwork,
+                          comparison: Dict[str, Dict], dataset_name: str,
+                          filename: Optional[str] = None) -> Path:
+        """
+        Експортує порівняння МПО та ЕМ-ГА у CSV (рядок на метод)
+
+        Args:
+            network_before: Вихідна мережа до оптимізації
+            comparison: Словник run_comparison ({'mpo': ..., 'ga': ...})
+            dataset_name: Назва набору даних
+            filename: Ім'я файлу (None — з часовою міткою)
+
+        Returns:
+            Шлях до створеного файлу
+        """
+        # Обидва рядки порівняння ділять одну часову мітку
+        now = datetime.now()
+        if filename is None:
+            filename = f"comparison_{now.strftime('%Y%m%d_%H%M%S')}.csv"
+        filepath = self.results_dir / filename
+
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+        rows = [
+            self._prepare_single_row(network_before, data['network'],
+                                     data['results'], method_name,
+                                     dataset_name, data['execution_time'],
+                                     timestamp)
+            for method_name, data in (('МПО', comparison['mpo']),
+                                      ('ЕМ-ГА', comparison['ga']))
+        ]
+        # Увесь файл збирається в один рядок і пишеться одним write
+        text = _HEADER_LINE + ''.join(_ROW_FMT.format_map(row) for row in rows)
+        with open(filepath, 'wb') as f:
+            f.write(_BOM + text.encode('utf-8'))
+        return filepath
+
+    def open_log(self, log_filename: str = 'experiments_log.csv') -> None:
+        """
+        Відкриває журнал експериментів для серії записів
+
+        Файл відкривається один раз у режимі дозапису з великим буфером;
+        заголовок пишеться лише для порожнього файлу. Подальші виклики
+        append_to_experiments_log використовують цей дескриптор без
+        повторних open/close на кожен рядок.
+        """
+        if self._log_fh is not None:
+            return
+        filepath = self.results_dir / log_filename
+        write_header = not filepath.exists() or os.path.getsize(filepath) == 0
+        self._log_fh = open(filepath, 'ab', buffering=1 << 20)
+        if write_header:
+            # Новий файл починається з BOM, як і разові експорти —
+            # інакше Excel читає кирилицю журналу в системній кодировці
+            self._log_fh.write(_BOM + _HEADER_LINE.encode('utf-8'))
+
+    def close_log(self) -> None:
+        """Скидає накопичені рядки та закриває журнал експериментів"""
+        self._flush_log()
+        if self._log_fh is not None:
+            self._log_fh.flush()
+            self._log_fh.close()
+            self._log_fh = None
+
+    def _flush_log(self) -> None:
+        """Скидає накопичувач журналу одним записом"""
+        if not self._log_buffer:
+            return
+        text = ''.join(self._log_buffer)
+        self._log_buffer.clear()
+
+        if self._log_fh is not None:
+            self._log_fh.write(text.encode('utf-8'))
+            return
+
+        filepath = self.results_dir / self._log_filename
+        write_header = not filepath.exists() or os.path.getsize(filepath) == 0
+        with open(filepath, 'ab') as f:
+            if write_header:
+                f.write(_BOM + _HEADER_LINE.encode('utf-8'))
+            f.write(text.encode('utf-8'))
+
+    def __enter__(self):
+        self.open_log()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_log()
+
+    def append_to_experiments_log(self, network_before: LogisticsNetwork,
+                                  network_after: LogisticsNetwork,
+                                  results: Dict[str, float], method_name: str,
+                                  dataset_name: str, execution_time: float,
+                                  log_filename: str = 'experiments_log.csv') -> None:
+        """
+        Додає рядок до накопичувального журналу експериментів
+
+        Рядок потрапляє в накопичувач; на диск пакет іде при відкритому
+        дескрипторі журналу, при досягненні порогу за розміром або при
+        закритті (close_log викликається й через atexit), тож серія
+        експериментів коштує один open на пакет, а не на рядок.
+        """
+        row = self._prepare_single_row(network_before, network_after, results,
+                                       method_name, dataset_name, execution_time,
+                                       datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        self._log_filename = log_filename
+        self._log_buffer.append(_ROW_FMT.format_map(row))
+        if (self._log_fh is not None
+                or len(self._log_buffer) >= self._log_flush_every):
+            self._flush_log()
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Генерація синтетичних логістичних мереж для тестів
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from optimizers._kernels import njit
+
+_FIELDNAMES = ('id', 'x', 'y', 'type', 'demand', 'terminal_cost',
+               'processing_cost')
+
+# Коди типів вузлів у SoA-поданні та npz-файлах
+_TYPE_CODES = {'center': 0, 'terminal': 1, 'consumer': 2}
+_TYPE_NAMES = np.array(['center', 'terminal', 'consumer'])
+
+
+@dataclass
+class GeneratedNetwork:
+    """
+    SoA-подання згенерованої мережі: сім паралельних масивів замість
+    словника на кожен вузол
+
+    Порядок вузлів: центр, термінали, споживачі. Типи закодовано
+    int8 (0 — центр, 1 — термінал, 2 — споживач).
+    """
+    ids: np.ndarray
+    xs: np.ndarray
+    ys: np.ndarray
+    types: np.ndarray
+    demands: np.ndarray
+    terminal_costs: np.ndarray
+    processing_costs: np.ndarray
+
+    @classmethod
+    def from_nodes(cls, nodes: List[Dict]) -> 'GeneratedNetwork':
+        """Будує SoA-подання зі списку вузлів-словників"""
+        n = len(nodes)
+        return cls(
+            ids=np.fromiter((node['id'] for node in nodes), np.int64, n),
+            xs=np.fromiter((node['x'] for node in nodes), np.float64, n),
+            ys=np.fromiter((node['y'] for node in nodes), np.float64, n),
+            types=np.fromiter((_TYPE_CODES[node['type']] for node in nodes),
+                              np.int8, n),
+            demands=np.fromiter((node['demand'] for node in nodes), np.int64, n),
+            terminal_costs=np.fromiter((node['terminal_cost'] for node in nodes),
+                                       np.int64, n),
+            processing_costs=np.fromiter((node['processing_cost'] for node in nodes),
+                                         np.int64, n))
+
+    def rows(self) -> List[tuple]:
+        """Повертає вузли кортежами у порядку колонок CSV"""
+        return list(zip(self.ids.tolist(), self.xs.tolist(), self.ys.tolist(),
+                        _TYPE_NAMES[self.types].tolist(), self.demands.tolist(),
+                        self.terminal_costs.tolist(),
+                        self.processing_costs.tolist()))
+
+
+@njit(cache=True)
+def _filter_centers(candidates, n_clusters, min_d2):
+    """
+    Відсіює з кандидатів центри кластерів, закороткі один до одного
+
+    Ядро чисте: кандидати розігруються зовні (власним ГВЧ генератора),
+    сюди потрапляє готовий масив — без звертань до глобального стану
+    np.random. Перевірка мінімальної відстані йде за квадратами
+    (sqrt монотонний, корінь зайвий).
+    """
+    centers = np.empty((n_clusters, 2))
+    count = 0
+    for i in range(candidates.shape[0]):
+        x = candidates[i, 0]
+        y = candidates[i, 1]
+        ok = True
+        for j in range(count):
+            dx = x - centers[j, 0]
+            dy = y - centers[j, 1]
+            if dx * dx + dy * dy < min_d2:
+                ok = False
+                break
+        if ok:
+            centers[count, 0] = x
+            centers[count, 1] = y
+            count += 1
+            if count == n_clusters:
+                break
+    return centers[:count]
+
+
+class NetworkGenerator:
+    """
+    Генератор тестових мереж у форматі data/network_data.csv
+
+    Термінали групуються навколо кластерних центрів, споживачі —
+    навколо терміналів; генерація детермінована за сідом.
+    """
+
+    def __init__(self, area_size: float = 100.0, seed: int = 42):
+        """
+        Ініціалізація генератора
+
+        Args:
+            area_size: Розмір квадратної області розміщення
+            seed: Сід генератора випадкових чисел
+
+        Кожен генератор має власний екземпляр ГВЧ — глобальний стан
+        модуля random не чіпається, тож генератори можна запускати
+        паралельно без взаємовпливу.
+        """
+        self.area_size = area_size
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def _generate_cluster_centers(self, n_clusters: int) -> List[Tuple[float, float]]:
+        """
+        Повертає центри кластерів для розміщення терміналів
+
+        Для 3-5 кластерів позиції фіксовані (рівномірно покривають
+        область); для інших кількостей центри підбираються випадково
+        з відсіюванням занадто близьких кандидатів.
+        """
+        area = self.area_size
+        if n_clusters == 3:
+            return [(0.25 * area, 0.25 * area), (0.75 * area, 0.3 * area),
+                    (0.5 * area, 0.75 * area)]
+        if n_clusters == 4:
+            return [(0.25 * area, 0.25 * area), (0.75 * area, 0.25 * area),
+                    (0.25 * area, 0.75 * area), (0.75 * area, 0.75 * area)]
+        if n_clusters == 5:
+            return [(0.25 * area, 0.25 * area), (0.75 * area, 0.25 * area),
+                    (0.25 * area, 0.75 * area), (0.75 * area, 0.75 * area),
+                    (0.5 * area, 0.5 * area)]
+
+        # Випадковий відбір центрів: кандидати розігруються власним ГВЧ
+        # генератора, відсіювання закоротких — у JIT-ядрі зі звіркою
+        # квадратів відстаней замість Python-циклу з math.sqrt
+        margin = 0.15 * area
+        candidates = self.rng.uniform(margin, area - margin,
+                                      size=(n_clusters * 100, 2))
+        centers = _filter_centers(candidates, n_clusters, (0.3 * area) ** 2)
+        return [(x, y) for x, y in centers]
+
+    def generate_network(self, n_terminals: int, n_consumers: int,
+                         demand_range: Tuple[int, int] = (80, 160),
+                         terminal_cost_range: Tuple[float, float] = (4000, 6000),
+                         processing_cost_range: Tuple[float, float] = (8, 15)) -> GeneratedNetwork:
+        """
+        Генерує мережу у SoA-поданні
+
+        Вузли пишуться напряму в попередньо виділені паралельні масиви
+        (без словника на вузол); випадкові величини тягнуться пакетами
+        з Generator замість скалярних викликів на кожен вузол.
+
+        Args:
+            n_terminals: Кількість терміналів
+            n_consumers: Кількість споживачів
+            demand_range: Діапазон попиту споживача
+            terminal_cost_range: Діапазон фіксованих витрат терміналу
+            processing_cost_range: Діапазон вартості обробки
+
+        Returns:
+            GeneratedNetwork з вузлами у порядку центр, термінали,
+            споживачі
+        """
+        area = self.area_size
+        n_total = 1 + n_terminals + n_consumers
+        xs = np.empty(n_total)
+        ys = np.empty(n_total)
+        types = np.full(n_total, _TYPE_CODES['consumer'], dtype=np.int8)
+        demands = np.zeros(n_total, dtype=np.int64)
+        terminal_costs = np.zeros(n_total, dtype=np.int64)
+        processing_costs = np.zeros(n_total, dtype=np.int64)
+
+        xs[0] = ys[0] = round(area / 2, 1)
+        types[0] = _TYPE_CODES['center']
+
+        # Термінали: координати кластерів і випадкові зсуви рахуються
+        # масивно на весь зріз одразу
+        clusters = np.array(self._generate_cluster_centers(min(n_terminals, 4)))
+        cluster_xy = clusters[np.arange(n_terminals) % len(clusters)]
+        t_angles = self.rng.uniform(0, 2 * np.pi, n_terminals)
+        t_radii = self.rng.uniform(2, 8, n_terminals)
+        t_slice = slice(1, 1 + n_terminals)
+        xs[t_slice] = np.round(np.clip(
+            cluster_xy[:, 0] + t_radii * np.cos(t_angles), 0, area), 1)
+        ys[t_slice] = np.round(np.clip(
+            cluster_xy[:, 1] + t_radii * np.sin(t_angles), 0, area), 1)
+        types[t_slice] = _TYPE_CODES['terminal']
+        terminal_costs[t_slice] = np.round(
+            self.rng.uniform(*terminal_cost_range, n_terminals)).astype(np.int64)
+        processing_costs[t_slice] = np.round(
+            self.rng.uniform(*processing_cost_range, n_terminals)).astype(np.int64)
+
+        # Споживачі розподіляються по терміналах максимально рівномірно;
+        # кожен термінал заповнює свій зріз масивів пакетною вибіркою
+        base, extra = divmod(n_consumers, n_terminals)
+        start = 1 + n_terminals
+        for i in range(n_terminals):
+            count = base + (1 if i < extra else 0)
+            angles = self.rng.uniform(0, 2 * np.pi, count)
+            radii = self.rng.uniform(1, 10, count)
+            c_slice = slice(start, start + count)
+            xs[c_slice] = np.round(np.clip(
+                xs[1 + i] + radii * np.cos(angles), 0, area), 1)
+            ys[c_slice] = np.round(np.clip(
+                ys[1 + i] + radii * np.sin(angles), 0, area), 1)
+            demands[c_slice] = self.rng.integers(demand_range[0],
+                                                 demand_range[1] + 1, count)
+            start += count
+
+        return GeneratedNetwork(ids=np.arange(n_total, dtype=np.int64),
+                                xs=xs, ys=ys, types=types, demands=demands,
+                                terminal_costs=terminal_costs,
+                                processing_costs=processing_costs)
+
+    def save_to_csv(self, network: GeneratedNetwork, filepath: str) -> str:
+        """
+        Зберігає мережу у CSV формату load_network_from_csv
+
+        Returns:
+            Шлях до записаного файлу
+        """
+        dirname = os.path.dirname(filepath)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        # Рядки — кортежі у порядку колонок: csv.writer пише їх
+        # позиційно, без пошуку полів по словниках у DictWriter
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(_FIELDNAMES)
+            writer.writerows(network.rows())
+        return filepath
+
+    def save_to_npz(self, network: GeneratedNetwork, filepath: str) -> str:
+        """
+        Зберігає мережу у бінарний .npz зі стовпцями-масивами
+
+        Завантаження через load_network_from_npz минає розбір CSV
+        (і поле за полем float()) — читається шість готових масивів.
+
+        Returns:
+            Шлях до записаного файлу
+        """
+        dirname = os.path.dirname(filepath)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        np.savez(filepath,
+                 id=network.ids,
+                 x=network.xs,
+                 y=network.ys,
+                 type=network.types,
+                 demand=network.demands.astype(np.float64),
+                 terminal_cost=network.terminal_costs.astype(np.float64),
+                 processing_cost=network.processing_costs.astype(np.float64))
+        return filepath
@@ -4,12 +4,20 @@
 """
 
 import os
+
+import matplotlib
+
+# У безголовому середовищі (пакетні запуски, експорт у файли) одразу
+# беремо Agg — без ініціалізації інтерактивного бекенда
+if 'MPLBACKEND' not in os.environ and not os.environ.get('DISPLAY'):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from typing import List, Optional
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from typing import Optional
 from models.network import LogisticsNetwork
-from models.element import Center, Terminal, Consumer
-import copy
 
 
 class NetworkVisualizer:
@@ -17,14 +25,22 @@ class NetworkVisualizer:
     Клас для візуалізації логістичної мережі
     """
 
-    def __init__(self, figsize=(12, 8)):
+    def __init__(self, figsize=(12, 8), backend: Optional[str] = None):
         """
         Ініціалізація візуалізатора
 
         Args:
             figsize: Розмір фігури (ширина, висота)
+            backend: Явний бекенд matplotlib (наприклад, 'Agg' для
+                пакетної генерації без показу; None — автовибір)
         """
+        if backend is not None:
+            matplotlib.use(backend, force=True)
         self.figsize = figsize
+        # Кешована фігура порівняння: повторні виклики compare_networks
+        # очищають осі замість створення нових subplots
+        self._cmp_fig = None
+        self._cmp_axes = None
         self.colors = {
             'center': '#FF6B6B',      # Червоний
             'terminal_active': '#4ECDC4',  # Бірюзовий
@@ -33,8 +49,26 @@ class NetworkVisualizer:
             'connection': '#BDC3C7',  # Світло-сірий
         }
 
+        # Категорії легенди фіксовані — готуємо маркери один раз замість
+        # дедуплікації підписаних артистів на кожному малюванні
+        self._legend_handles = [
+            Line2D([], [], linestyle='none', marker='s', markersize=12,
+                   markerfacecolor=self.colors['center'],
+                   markeredgecolor='black', label='Розподільчий центр'),
+            Line2D([], [], linestyle='none', marker='^', markersize=11,
+                   markerfacecolor=self.colors['terminal_active'],
+                   markeredgecolor='black', label='Активний термінал'),
+            Line2D([], [], linestyle='none', marker='x', markersize=11,
+                   markeredgewidth=2, color=self.colors['terminal_inactive'],
+                   label='Неактивний термінал'),
+            Line2D([], [], linestyle='none', marker='o', markersize=8,
+                   markerfacecolor=self.colors['consumer'],
+                   markeredgecolor='black', label='Споживач'),
+        ]
+
     def plot_network(self, network: LogisticsNetwork, title: str = "Логістична мережа",
-                    show_connections: bool = True, ax=None):
+                    show_connections: bool = True, ax=None,
+                    max_labels: int = 20):
         """
         Малює мережу на графіку
 
@@ -43,6 +77,9 @@ class NetworkVisualizer:
             title: Заголовок графіка
             show_connections: Показувати з'єднання між елементами
             ax: Matplotlib axes (якщо None, створюється новий)
+            max_labels: Межа кількості терміналів, до якої малюються
+                текстові підписи (на великих мережах підписи зливаються
+                і лише сповільнюють рендеринг)
 
         Returns:
             Matplotlib axes
@@ -56,45 +93,46 @@ class NetworkVisualizer:
 
         # Малюємо центр
         center = network.get_center()
-        ax.scatter(center.x, center.y, c=self.colors['center'], 
-                  s=500, marker='s', label='Розподільчий центр',
+        ax.scatter(center.x, center.y, c=self.colors['center'],
+                  s=500, marker='s',
                   edgecolors='black', linewidths=2, zorder=5)
         ax.text(center.x, center.y - 5, f'DC', 
                ha='center', va='top', fontsize=10, fontweight='bold')
 
-        # Малюємо термінали
-        for terminal in network.terminals:
-            if terminal.is_active:
-                color = self.colors['terminal_active']
-                label = 'Активний термінал'
-                marker = '^'
-                # Для заповнених маркерів додаємо рамку
-                ax.scatter(terminal.x, terminal.y, c=color, s=300,
-                          marker=marker, label=label,
-                          edgecolors='black', linewidths=1.5, zorder=4)
-            else:
-                color = self.colors['terminal_inactive']
-                label = 'Неактивний термінал'
-                marker = 'x'
-                # Для маркера 'x' не використовуємо edgecolors
-                ax.scatter(terminal.x, terminal.y, c=color, s=300,
-                          marker=marker, label=label, linewidths=2, zorder=4)
-
-            status = "✓" if terminal.is_active else "✗"
-            ax.text(terminal.x, terminal.y + 5, f'T{terminal.id} {status}',
-                   ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-        # Малюємо споживачів
-        consumer_x = [c.x for c in network.consumers]
-        consumer_y = [c.y for c in network.consumers]
-        ax.scatter(consumer_x, consumer_y, c=self.colors['consumer'], 
-                  s=100, marker='o', label='Споживач',
+        # Малюємо термінали: по одному scatter на категорію замість
+        # виклику (і PathCollection) на кожен термінал
+        arr = network.arrays
+        arr.sync_terminals(network.terminals)
+        active = arr.is_active
+        if active.any():
+            ax.scatter(arr.tx[active], arr.ty[active],
+                      c=self.colors['terminal_active'], s=300,
+                      marker='^',
+                      edgecolors='black', linewidths=1.5, zorder=4)
+        if not active.all():
+            # Для маркера 'x' не використовуємо edgecolors
+            ax.scatter(arr.tx[~active], arr.ty[~active],
+                      c=self.colors['terminal_inactive'], s=300,
+                      marker='x', linewidths=2, zorder=4)
+
+        # Підписи — єдина поелементна робота; на великих мережах Text-
+        # артисти домінують у часі малювання, тому їх кількість обмежена
+        if len(network.terminals) <= max_labels:
+            for terminal in network.terminals:
+                status = "✓" if terminal.is_active else "✗"
+                ax.text(terminal.x, terminal.y + 5, f'T{terminal.id} {status}',
+                       ha='center', va='bottom', fontsize=9, fontweight='bold')
+
+        # Малюємо споживачів одним викликом із SoA-масивів мережі
+        ax.scatter(network.arrays.ux, network.arrays.uy, c=self.colors['consumer'],
+                  s=100, marker='o', rasterized=True,
                   edgecolors='black', linewidths=0.5, alpha=0.7, zorder=3)
 
-        # Підписи для перших 5 споживачів
-        for i, consumer in enumerate(network.consumers[:5]):
-            ax.text(consumer.x + 2, consumer.y + 2, f'C{consumer.id}', 
-                   fontsize=7, alpha=0.7)
+        # Підписи для перших 5 споживачів; clip_on дозволяє matplotlib
+        # не рендерити підписи поза видимою областю
+        for consumer in network.consumers[:5]:
+            ax.text(consumer.x + 2, consumer.y + 2, f'C{consumer.id}',
+                   fontsize=7, alpha=0.7, clip_on=True)
 
         # Налаштування графіка
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
@@ -102,42 +140,67 @@ class NetworkVisualizer:
         ax.set_ylabel('Y координата', fontsize=11)
         ax.grid(True, alpha=0.3, linestyle='--')
         
-        # Видаляємо дублікати в легенді
-        handles, labels = ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))
-        ax.legend(by_label.values(), by_label.keys(), 
+        # Легенда з готових маркерів категорій — без збирання та
+        # дедуплікації підписів артистів
+        ax.legend(handles=self._legend_handles,
                  loc='upper right', fontsize=9, framealpha=0.9)
 
         # Додаємо відступи
         ax.margins(0.1)
 
+        # У векторних форматах растеризуються лише "важкі" артисти
+        # (з'єднання та споживачі, zorder <= 3); маркери терміналів,
+        # центр, підписи та легенда лишаються векторними
+        ax.set_rasterization_zorder(3.5)
+
         return ax
 
-    def _draw_connections(self, network: LogisticsNetwork, ax):
+    def _draw_connections(self, network: LogisticsNetwork, ax,
+                          max_edges: int = 2000):
         """
         Малює з'єднання між елементами мережі
 
         Args:
             network: Логістична мережа
             ax: Matplotlib axes
+            max_edges: Межа кількості відрізків термінал → споживач;
+                на більших мережах малюється випадкова підвибірка
+                (детермінована — сід фіксований), візуально картина
+                з'єднань не змінюється
         """
         center = network.get_center()
-
-        # З'єднання центр → активні термінали
-        for terminal in network.get_active_terminals():
-            ax.plot([center.x, terminal.x], [center.y, terminal.y],
-                   color=self.colors['connection'], linewidth=2, 
-                   linestyle='-', alpha=0.4, zorder=1)
-
-        # З'єднання термінали → споживачі
-        for consumer in network.consumers:
-            terminal = network.get_terminal_by_id(consumer.assigned_terminal)
-            if terminal.is_active:
-                ax.plot([terminal.x, consumer.x], [terminal.y, consumer.y],
-                       color=self.colors['connection'], linewidth=0.5, 
-                       linestyle='--', alpha=0.3, zorder=1)
-
-    def compare_networks(self, network_before: LogisticsNetwork, 
+        arr = network.arrays
+        arr.sync_terminals(network.terminals)
+
+        # З'єднання центр → активні термінали: одна LineCollection
+        # замість Line2D на кожен термінал
+        active_idx = np.flatnonzero(arr.is_active)
+        if active_idx.size:
+            segments_ct = np.stack([
+                np.broadcast_to((center.x, center.y), (active_idx.size, 2)),
+                np.column_stack([arr.tx[active_idx], arr.ty[active_idx]]),
+            ], axis=1)
+            ax.add_collection(LineCollection(
+                segments_ct, colors=self.colors['connection'], linewidths=2,
+                alpha=0.4, zorder=1, rasterized=True))
+
+        # З'єднання термінали → споживачі: всі відрізки однією
+        # LineCollection замість Line2D на кожного споживача
+        assigned = arr.assigned
+        mask = arr.is_active[assigned] & (assigned >= 0)
+        segments = np.stack([
+            np.column_stack([arr.tx[assigned], arr.ty[assigned]]),
+            np.column_stack([arr.ux, arr.uy]),
+        ], axis=1)[mask]
+        if len(segments) > max_edges:
+            keep = np.random.default_rng(0).choice(len(segments), max_edges,
+                                                   replace=False)
+            segments = segments[keep]
+        ax.add_collection(LineCollection(
+            segments, colors=self.colors['connection'], linewidths=0.5,
+            linestyles='--', alpha=0.3, zorder=1, rasterized=True))
+
+    def compare_networks(self, network_before: LogisticsNetwork,
                         network_after: LogisticsNetwork,
                         costs_before: dict, costs_after: dict,
                         save_path: Optional[str] = None):
@@ -151,7 +214,11 @@ class NetworkVisualizer:
             costs_after: Витрати після оптимізації
             save_path: Шлях для збереження графіка
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
+        if self._cmp_fig is None:
+            self._cmp_fig, self._cmp_axes = plt.subplots(1, 2, figsize=(20, 8))
+        fig, (ax1, ax2) = self._cmp_fig, self._cmp_axes
+        ax1.clear()
+        ax2.clear()
 
         # Ліва панель - до оптимізації
         self.plot_network(network_before, 
@@ -176,8 +243,67 @@ class NetworkVisualizer:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"\n📊 Графік збережено: {save_path}")
+            # Пакетний режим: фігура кешована для повторних викликів,
+            # показ не потрібен
+        else:
+            plt.show()
 
-        plt.show()
+    def _draw_category_bars(self, ax, costs_before: dict, costs_after: dict):
+        """Малює стовпчикову діаграму витрат по категоріях на заданих осях"""
+        categories = ['Фіксовані\nвитрати', 'Обробка', 'Транспорт\nЦентр→Термінали',
+                     'Транспорт\nТермінали→Споживачі']
+
+        cost_keys = ('fixed_costs', 'processing_costs',
+                     'transport_center_to_terminal',
+                     'transport_terminal_to_consumer')
+        before_values = np.array([costs_before[k] for k in cost_keys])
+        after_values = np.array([costs_after[k] for k in cost_keys])
+
+        # Позиції стовпчиків — масивною арифметикою замість списокових
+        # зсувів
+        x = np.arange(len(categories))
+        width = 0.35
+
+        ax.bar(x - width / 2, before_values, width,
+              label='До оптимізації', color='#E74C3C', alpha=0.8)
+        ax.bar(x + width / 2, after_values, width,
+              label='Після оптимізації', color='#27AE60', alpha=0.8)
+
+        ax.set_xlabel('Категорія витрат', fontsize=11)
+        ax.set_ylabel('Вартість', fontsize=11)
+        ax.set_title('Порівняння витрат по категоріях', fontsize=12, fontweight='bold')
+        ax.set_xticks(x)
+        ax.set_xticklabels(categories, fontsize=9)
+        ax.legend(fontsize=10)
+        ax.grid(axis='y', alpha=0.3)
+
+    def _draw_total_bars(self, ax, costs_before: dict, costs_after: dict):
+        """Малює порівняння загальних витрат зі стрілкою економії"""
+        total_before = costs_before['total_cost']
+        total_after = costs_after['total_cost']
+        saving = total_before - total_after
+        saving_pct = (saving / total_before) * 100
+
+        bars = ax.bar(['До оптимізації', 'Після оптимізації'],
+                     [total_before, total_after],
+                     color=['#E74C3C', '#27AE60'], alpha=0.8, width=0.5)
+
+        # Значення на стовпчиках одним викликом bar_label замість
+        # створення Text-артиста вручну на кожен стовпчик
+        ax.bar_label(bars, fmt='{:,.0f}', padding=2,
+                    fontsize=11, fontweight='bold')
+
+        # Стрілка економії
+        ax.annotate('', xy=(1, total_after), xytext=(1, total_before),
+                   arrowprops=dict(arrowstyle='<->', color='green', lw=2))
+        ax.text(1.15, (total_before + total_after) / 2,
+               f'Економія:\n{saving:,.0f}\n({saving_pct:.1f}%)',
+               fontsize=10, color='green', fontweight='bold',
+               va='center')
+
+        ax.set_ylabel('Загальні витрати', fontsize=11)
+        ax.set_title('Загальні витрати', fontsize=12, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3)
 
     def plot_cost_comparison(self, costs_before: dict, costs_after: dict,
                             save_path: Optional[str] = None):
@@ -191,76 +317,62 @@ class NetworkVisualizer:
         """
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
 
-        # Категорії витрат
-        categories = ['Фіксовані\nвитрати', 'Обробка', 'Транспорт\nЦентр→Термінали',
-                     'Транспорт\nТермінали→Споживачі']
-        
-        before_values = [
-            costs_before['fixed_costs'],
-            costs_before['processing_costs'],
-            costs_before['transport_center_to_terminal'],
-            costs_before['transport_terminal_to_consumer']
-        ]
-        
-        after_values = [
-            costs_after['fixed_costs'],
-            costs_after['processing_costs'],
-            costs_after['transport_center_to_terminal'],
-            costs_after['transport_terminal_to_consumer']
-        ]
+        self._draw_category_bars(ax1, costs_before, costs_after)
+        self._draw_total_bars(ax2, costs_before, costs_after)
 
-        # Графік 1: Стовпчикова діаграма
-        x = range(len(categories))
-        width = 0.35
-
-        bars1 = ax1.bar([i - width/2 for i in x], before_values, width, 
-                       label='До оптимізації', color='#E74C3C', alpha=0.8)
-        bars2 = ax1.bar([i + width/2 for i in x], after_values, width,
-                       label='Після оптимізації', color='#27AE60', alpha=0.8)
-
-        ax1.set_xlabel('Категорія витрат', fontsize=11)
-        ax1.set_ylabel('Вартість', fontsize=11)
-        ax1.set_title('Порівняння витрат по категоріях', fontsize=12, fontweight='bold')
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(categories, fontsize=9)
-        ax1.legend(fontsize=10)
-        ax1.grid(axis='y', alpha=0.3)
-
-        # Графік 2: Загальні витрати
-        total_before = costs_before['total_cost']
-        total_after = costs_after['total_cost']
-        saving = total_before - total_after
-        saving_pct = (saving / total_before) * 100
+        plt.tight_layout()
 
-        bars = ax2.bar(['До оптимізації', 'Після оптимізації'], 
-                      [total_before, total_after],
-                      color=['#E74C3C', '#27AE60'], alpha=0.8, width=0.5)
+        if save_path:
+            # Створюємо директорію якщо не існує
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            print(f"\n📊 Графік витрат збережено: {save_path}")
+            # Пакетний режим: фігура зберігається, показ не потрібен
+            plt.close(fig)
+        else:
+            plt.show()
+
+    def plot_full_report(self, network_before: LogisticsNetwork,
+                         network_after: LogisticsNetwork,
+                         costs_before: dict, costs_after: dict,
+                         save_path: Optional[str] = None):
+        """
+        Малює повний звіт однією фігурою 2×2
 
-        # Додаємо значення на стовпчиках
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:,.0f}',
-                    ha='center', va='bottom', fontsize=11, fontweight='bold')
+        Верхній ряд — мережі до/після оптимізації, нижній — діаграми
+        витрат. Замість двох окремих фігур (compare_networks +
+        plot_cost_comparison) створюється одна: один tight_layout та
+        один savefig на звіт.
 
-        # Стрілка економії
-        ax2.annotate('', xy=(1, total_after), xytext=(1, total_before),
-                    arrowprops=dict(arrowstyle='<->', color='green', lw=2))
-        ax2.text(1.15, (total_before + total_after) / 2,
-                f'Економія:\n{saving:,.0f}\n({saving_pct:.1f}%)',
-                fontsize=10, color='green', fontweight='bold',
-                va='center')
+        Args:
+            network_before: Мережа до оптимізації
+            network_after: Мережа після оптимізації
+            costs_before: Витрати до оптимізації
+            costs_after: Витрати після оптимізації
+            save_path: Шлях для збереження графіка
+        """
+        fig, axs = plt.subplots(2, 2, figsize=(20, 14))
 
-        ax2.set_ylabel('Загальні витрати', fontsize=11)
-        ax2.set_title('Загальні витрати', fontsize=12, fontweight='bold')
-        ax2.grid(axis='y', alpha=0.3)
+        self.plot_network(network_before,
+                         title=f"До оптимізації\nВитрати: {costs_before['total_cost']:,.2f}",
+                         ax=axs[0, 0])
+        improvement_pct = ((costs_before['total_cost'] - costs_after['total_cost']) /
+                          costs_before['total_cost']) * 100
+        self.plot_network(network_after,
+                         title=f"Після оптимізації\nВитрати: {costs_after['total_cost']:,.2f} (↓{improvement_pct:.1f}%)",
+                         ax=axs[0, 1])
+        self._draw_category_bars(axs[1, 0], costs_before, costs_after)
+        self._draw_total_bars(axs[1, 1], costs_before, costs_after)
 
-        plt.tight_layout()
+        fig.suptitle('ЗВІТ ПРО ОПТИМІЗАЦІЮ ЛОГІСТИЧНОЇ МЕРЕЖІ',
+                    fontsize=16, fontweight='bold', y=0.99)
+        plt.tight_layout(rect=[0, 0, 1, 0.97])
 
         if save_path:
             # Створюємо директорію якщо не існує
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"\n📊 Графік витрат збережено: {save_path}")
-
-        plt.show()
+            print(f"\n📊 Повний звіт збережено: {save_path}")
+            plt.close(fig)
+        else:
+            plt.show()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Спільні pytest-фікстури для тестів оптимізатора
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.data_loader import load_network_from_csv, validate_network_data
+from models.network import LogisticsNetwork
+
+_DATA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'network_data.csv')
+_CACHE_PKL = os.path.join(os.path.dirname(_DATA_CSV), '.cache', 'network_data.pkl')
+
+
+def _build_network() -> LogisticsNetwork:
+    """Завантажує, валідує та будує мережу з основного набору даних"""
+    centers, terminals, consumers = load_network_from_csv(_DATA_CSV)
+    validate_network_data(centers, terminals, consumers)
+    return LogisticsNetwork(centers, terminals, consumers)
+
+
+@pytest.fixture(scope='session')
+def network() -> LogisticsNetwork:
+    """
+    Валідована логістична мережа з data/network_data.csv
+
+    Мережа будується один раз на сесію і кешується на диску через
+    pickle (інвалідація за mtime CSV), тож повторні запуски pytest не
+    платять за парсинг і валідацію. Тести, що мутують мережу, мають
+    працювати на copy.deepcopy(network).
+    """
+    if (os.path.exists(_CACHE_PKL)
+            and os.path.getmtime(_CACHE_PKL) > os.path.getmtime(_DATA_CSV)):
+        with open(_CACHE_PKL, 'rb') as f:
+            return pickle.load(f)
+
+    net = _build_network()
+    os.makedirs(os.path.dirname(_CACHE_PKL), exist_ok=True)
+    with open(_CACHE_PKL, 'wb') as f:
+        pickle.dump(net, f)
+    return net